@@ -2,11 +2,11 @@
 YouTube 좋아요 영상 요약 프로젝트 - 메인 실행 파일 (Whisper 통합)
 """
 import os
-import yaml
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from tqdm import tqdm
 
+from src.config_loader import load_config
 from src.youtube_collector import YouTubeCollector
 from src.transcript_extractor import TranscriptExtractor
 from src.summarizer import VideoSummarizer
@@ -18,8 +18,7 @@ class YouTubeLikesSummarizer:
     def __init__(self, config_path='config/config.yaml'):
         """초기화"""
         # 설정 로드
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_config(config_path)
         
         # 모듈 초기화
         self.collector = YouTubeCollector(self.config)
@@ -43,40 +42,36 @@ class YouTubeLikesSummarizer:
         if use_whisper:
             print(f"🎤 Whisper 음성 인식 활성화됨 (모델: {whisper_model})")
     
-    def run_full_pipeline(self, max_videos=50, force_refresh=False):
+    def run_full_pipeline(self, max_videos=50, force_refresh=False, refresh_details=False):
         """
         전체 파이프라인 실행
         
         Args:
             max_videos: 수집할 최대 영상 수
             force_refresh: True면 기존 데이터 무시하고 새로 수집
+            refresh_details: True면 기존 데이터를 쓸 때 영상 정보(제목, 조회수 등)를 다시 조회
         """
         print("\n" + "="*60)
         print("🎬 YouTube 좋아요 영상 요약 시스템 시작")
         print("="*60 + "\n")
         
         # 1단계: YouTube 좋아요 영상 수집
-        print("\n[1/5] 📥 YouTube 좋아요 영상 수집 중...")
-        videos = self._collect_videos(max_videos, force_refresh)
+        print("\n[1/3] 📥 YouTube 좋아요 영상 수집 중...")
+        videos = self._collect_videos(max_videos, force_refresh, refresh_details)
         
         if not videos:
             print("❌ 수집된 영상이 없습니다.")
             return
         
-        # 2단계: 자막 추출 (Whisper 포함)
-        print("\n[2/5] 📝 영상 자막 추출 중...")
-        transcripts = self._extract_transcripts(videos)
+        # 같은 영상이 여러 번 수집된 경우 한 번만 처리
+        videos = self._dedup_videos(videos)
         
-        # 3단계: AI 요약 생성
-        print("\n[3/5] 🤖 AI 요약 생성 중...")
-        summaries = self._generate_summaries(transcripts)
+        # 2단계: 자막 추출 → AI 요약 → 카테고리 분류 (스트리밍)
+        print("\n[2/3] 📝 자막 추출 → 🤖 AI 요약 → 📂 카테고리 분류 중...")
+        transcripts, summaries, categorized = self._pipeline(videos)
         
-        # 4단계: 카테고리 분류
-        print("\n[4/5] 📂 카테고리 분류 중...")
-        categorized = self._categorize_videos(videos, transcripts)
-        
-        # 5단계: 리포트 생성
-        print("\n[5/5] 📊 리포트 생성 중...")
+        # 3단계: 리포트 생성
+        print("\n[3/3] 📊 리포트 생성 중...")
         self._generate_reports(summaries, categorized)
         
         print("\n" + "="*60)
@@ -85,7 +80,7 @@ class YouTubeLikesSummarizer:
         
         self._print_summary(summaries, categorized)
     
-    def _collect_videos(self, max_videos, force_refresh):
+    def _collect_videos(self, max_videos, force_refresh, refresh_details=False):
         """영상 수집"""
         if not force_refresh:
             # 기존 데이터 확인
@@ -94,10 +89,10 @@ class YouTubeLikesSummarizer:
                 print(f"  ℹ️  기존 데이터 발견: {len(existing)}개")
             if os.getenv('CI'):
                 print("  ℹ️  CI 환경 감지: 기존 데이터 자동 사용")
-                return existing
+                return self._refresh_details(existing) if refresh_details else existing
                 use_existing = input("  기존 데이터를 사용하시겠습니까? (y/n): ").lower()
                 if use_existing == 'y':
-                    return existing
+                    return self._refresh_details(existing) if refresh_details else existing
         
         # 새로 수집
         self.collector.authenticate()
@@ -106,10 +101,40 @@ class YouTubeLikesSummarizer:
         
         return videos
     
-    def _extract_transcripts(self, videos):
-        """자막 추출 (Whisper 포함)"""
-        transcripts = []
+    def _refresh_details(self, videos):
+        """기존 영상 목록의 정보를 다시 조회해 저장 (ID 50개씩 묶어 요청)"""
+        videos = self.collector.refresh_video_details(videos)
+        self.collector.save_to_json(videos)
+        return videos
+    
+    def _dedup_videos(self, videos):
+        """video_id 기준 중복 영상 제거 (처음 등장한 순서 유지)"""
+        seen = {}
+        duplicates = {}
+        
+        for video in videos:
+            video_id = video['video_id']
+            if video_id in seen:
+                duplicates.setdefault(video_id, []).append(video)
+            else:
+                seen[video_id] = video
+        
+        if duplicates:
+            duplicate_count = sum(len(items) for items in duplicates.values())
+            print(f"  ℹ️  중복 영상 {duplicate_count}개 제외 ({len(duplicates)}개 영상)")
+        
+        return list(seen.values())
+    
+    def _pipeline(self, videos):
+        """
+        자막 추출 → 요약 → 분류를 하나의 스트리밍 파이프라인으로 실행
         
+        자막이 추출되는 즉시 해당 영상의 요약을 예약하므로,
+        다른 영상의 자막 추출과 AI 요약이 동시에 진행됩니다.
+        
+        Returns:
+            tuple: (자막 리스트, 요약 리스트, 카테고리별 영상 그룹)
+        """
         whisper_config = self.config.get('whisper', {})
         fallback_only = whisper_config.get('fallback_only', True)
         
@@ -120,27 +145,109 @@ class YouTubeLikesSummarizer:
             else:
                 print("  ℹ️  Whisper: 모든 영상에 음성 인식 사용")
         
-        with tqdm(total=len(videos), desc="  자막 추출") as pbar:
-            for video in videos:
+        perf_config = self.config.get('performance', {})
+        transcript_workers = perf_config.get('transcript_workers', 4)
+        llm_concurrency = perf_config.get('llm_concurrency', 4)
+        
+        # 영상 순서를 유지하기 위해 인덱스 위치에 결과 저장
+        transcripts = [None] * len(videos)
+        summaries_by_index = {}
+        
+        # 저장된 자막 목록은 영상마다 파일을 확인하지 않고 한 번에 조회
+        cached_transcript_ids = self.extractor.list_cached_ids()
+        
+        transcript_pool = ThreadPoolExecutor(max_workers=transcript_workers)
+        summary_pool = ThreadPoolExecutor(max_workers=llm_concurrency)
+        # 진행 표시줄 갱신(터미널 출력)은 일정 간격으로만 수행
+        bar_options = {
+            'mininterval': 0.5,
+            'miniters': max(1, len(videos) // 100),
+            'smoothing': 0,
+        }
+        transcript_bar = tqdm(total=len(videos), desc="  자막 추출", position=0, **bar_options)
+        summary_bar = tqdm(total=0, desc="  요약 생성", position=1, **bar_options)
+        summary_futures = {}
+        
+        # 일반 영상은 llm_batch_size개씩 묶어 한 번에 요약 (1이면 개별 요약)
+        batch_size = perf_config.get('llm_batch_size', 1)
+        if batch_size > VideoSummarizer.MAX_GROUP_SIZE:
+            # 묶음이 크면 응답이 출력 토큰 상한에서 잘려 묶음 전체가 실패하므로 제한
+            print(f"  ⚠️  llm_batch_size {batch_size} → {VideoSummarizer.MAX_GROUP_SIZE} (출력 토큰 상한)")
+            batch_size = VideoSummarizer.MAX_GROUP_SIZE
+        pending_general = []
+        
+        def submit_summaries(group):
+            """(인덱스, 자막) 묶음을 요약 작업으로 예약"""
+            future = summary_pool.submit(self._summarize_group, [t for _, t in group])
+            summary_futures[future] = [i for i, _ in group]
+        
+        def on_transcript(i, transcript):
+            """자막이 준비되면 저장하고 요약 작업 예약 (메인 스레드에서만 호출)"""
+            transcripts[i] = transcript
+            transcript_bar.update(1)
+            
+            # 영어 학습 여부는 자막당 한 번만 판단하고 자막 파일에 함께 저장
+            if 'is_english' not in transcript:
+                transcript['is_english'] = self.extractor.is_english_content(transcript)
+            
+            # 자막이 있는 것만 요약
+            if transcript.get('status') != 'success':
+                return
+            
+            # 새 total은 다음 update()에서 간격 제한에 맞춰 함께 표시
+            summary_bar.total += 1
+            
+            # 모델/프롬프트 종류/자막이 같은 요약이 이미 있으면 재사용 (API 호출 없음)
+            prompt_type = 'english_learning' if transcript['is_english'] else 'general'
+            existing = self.summarizer.get_cached_summary(transcript, prompt_type)
+            if existing:
+                summaries_by_index[i] = existing
+                summary_bar.update(1)
+            elif batch_size > 1 and not transcript['is_english']:
+                pending_general.append((i, transcript))
+                if len(pending_general) >= batch_size:
+                    submit_summaries(pending_general[:])
+                    pending_general.clear()
+            else:
+                submit_summaries([(i, transcript)])
+        
+        try:
+            transcript_futures = {}
+            for i, video in enumerate(videos):
                 # 이미 추출된 자막이 있는지 확인
-                existing = self.extractor.load_transcript(video['video_id'])
+                existing = None
+                if video['video_id'] in cached_transcript_ids:
+                    existing = self.extractor.load_transcript(video['video_id'])
                 
                 if existing:
-                    transcripts.append(existing)
+                    on_transcript(i, existing)
                 else:
-                    transcript = self.extractor.extract_transcript(
-                        video['video_id'],
-                        url=video['url']
-                    )
-                    transcript['video_title'] = video['title']
-                    transcript['video_url'] = video['url']
-                    transcript['channel'] = video['channel']
-                    transcripts.append(transcript)
-                
-                pbar.update(1)
+                    future = transcript_pool.submit(self._extract_one, video)
+                    transcript_futures[future] = i
+            
+            for future in as_completed(transcript_futures):
+                on_transcript(transcript_futures[future], future.result())
+            
+            if pending_general:
+                submit_summaries(pending_general)
+            
+            # 모든 자막이 예약된 뒤 남은 요약 수집
+            for future in as_completed(summary_futures):
+                indices = summary_futures[future]
+                for i, summary in zip(indices, future.result()):
+                    summaries_by_index[i] = summary
+                summary_bar.update(len(indices))
+        finally:
+            transcript_pool.shutdown()
+            summary_pool.shutdown()
+            transcript_bar.close()
+            summary_bar.close()
+        
+        summaries = [summaries_by_index[i] for i in sorted(summaries_by_index)]
         
         # 저장
         self.extractor.save_transcripts(transcripts)
+        self.summarizer.save_summaries(summaries)
         
         success_count = len([t for t in transcripts if t['status'] == 'success'])
         whisper_count = len([t for t in transcripts if t.get('method') == 'whisper'])
@@ -149,46 +256,39 @@ class YouTubeLikesSummarizer:
         if whisper_count > 0:
             print(f"  🎤 Whisper로 인식: {whisper_count}개")
         
-        return transcripts
-    
-    def _generate_summaries(self, transcripts):
-        """요약 생성"""
-        # 자막이 있는 것만 요약
-        valid_transcripts = [t for t in transcripts if t.get('status') == 'success']
-        
-        if not valid_transcripts:
+        if summaries:
+            summary_count = len([s for s in summaries if s['status'] == 'success'])
+            print(f"  ✅ {summary_count}/{len(summaries)}개 요약 생성 완료")
+        else:
             print("  ⚠️  요약할 자막이 없습니다.")
-            return []
-        
-        print(f"  총 {len(valid_transcripts)}개 영상을 요약합니다...")
         
-        summaries = []
-        
-        with tqdm(total=len(valid_transcripts), desc="  요약 생성") as pbar:
-            for transcript in valid_transcripts:
-                # 이미 요약이 있는지 확인
-                existing = self.summarizer.load_summary(transcript['video_id'])
-                
-                if existing:
-                    summaries.append(existing)
-                else:
-                    # 영어 학습 콘텐츠 판단
-                    if self.extractor.is_english_content(transcript):
-                        summary = self.summarizer.summarize_english_learning(transcript)
-                    else:
-                        summary = self.summarizer.summarize_general(transcript)
-                    
-                    summaries.append(summary)
-                
-                pbar.update(1)
-        
-        # 저장
-        self.summarizer.save_summaries(summaries)
-        
-        success_count = len([s for s in summaries if s['status'] == 'success'])
-        print(f"  ✅ {success_count}/{len(valid_transcripts)}개 요약 생성 완료")
+        # 분류는 가벼운 작업이므로 메인 스레드에서 바로 실행
+        categorized = self._categorize_videos(videos, transcripts)
         
-        return summaries
+        return transcripts, summaries, categorized
+    
+    def _extract_one(self, video):
+        """영상 하나의 자막 추출 (작업 스레드에서 실행)"""
+        transcript = self.extractor.extract_transcript(
+            video['video_id'],
+            url=video['url']
+        )
+        transcript['video_title'] = video['title']
+        transcript['video_url'] = video['url']
+        transcript['channel'] = video['channel']
+        return transcript
+    
+    def _summarize_group(self, transcripts):
+        """자막 묶음 요약 (작업 스레드에서 실행, 입력 순서대로 반환)"""
+        if len(transcripts) == 1:
+            return [self._summarize_one(transcripts[0])]
+        return self.summarizer.summarize_general_group(transcripts)
+    
+    def _summarize_one(self, transcript):
+        """자막 하나 요약 (영어 학습 여부에 따라 프롬프트 선택)"""
+        if transcript['is_english']:
+            return self.summarizer.summarize_english_learning(transcript)
+        return self.summarizer.summarize_general(transcript)
     
     def _categorize_videos(self, videos, transcripts):
         """카테고리 분류"""
@@ -196,25 +296,13 @@ class YouTubeLikesSummarizer:
         return categorized
     
     def _generate_reports(self, summaries, categorized):
-        """리포트 생성"""
-        # Markdown 리포트
-        if self.config['output']['markdown_format']:
-            self.reporter.generate_markdown_report(summaries, categorized)
-        
-        # Excel 리포트
-        if self.config['output']['excel_export']:
-            self.reporter.generate_excel_report(summaries, categorized)
-        
-        # HTML 리포트 생성 (새로 추가!)
-        self.reporter.generate_html_report(summaries, categorized)
-        
-        # 복습 일정
-        english_summaries = [s for s in summaries if s.get('type') == 'english_learning']
-        if english_summaries:
-            self.reporter.generate_review_schedule(summaries)
-        
-        # 통계
-        self.reporter.generate_statistics(summaries, categorized)
+        """리포트 생성 (서로 다른 파일에 쓰므로 동시에 실행)"""
+        self.reporter.generate_all(
+            summaries,
+            categorized,
+            markdown=self.config['output']['markdown_format'],
+            excel=self.config['output']['excel_export']
+        )
     
     def _print_summary(self, summaries, categorized):
         """결과 요약 출력"""
@@ -239,6 +327,7 @@ def main():
     parser = argparse.ArgumentParser(description='YouTube 좋아요 영상 요약 시스템 (Whisper 통합)')
     parser.add_argument('--max-videos', type=int, default=50, help='수집할 최대 영상 수')
     parser.add_argument('--force-refresh', action='store_true', help='기존 데이터 무시하고 새로 수집')
+    parser.add_argument('--refresh-details', action='store_true', help='기존 데이터 사용 시 영상 정보(제목, 조회수 등) 갱신')
     parser.add_argument('--config', default='config/config.yaml', help='설정 파일 경로')
     
     args = parser.parse_args()
@@ -247,7 +336,8 @@ def main():
     system = YouTubeLikesSummarizer(config_path=args.config)
     system.run_full_pipeline(
         max_videos=args.max_videos,
-        force_refresh=args.force_refresh
+        force_refresh=args.force_refresh,
+        refresh_details=args.refresh_details
     )
 
 
@@ -1,12 +1,82 @@
 """
 영상 카테고리 자동 분류 모듈
 """
-import yaml
+import re
+
+# Aho-Corasick 다중 패턴 매칭 (선택사항)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 class VideoCategorizer:
     def __init__(self, config):
         self.categories = config.get('categories', {})
+        # 키워드 소문자 변환은 한 번만 수행
+        self._cats_lower = {
+            category: [keyword.lower() for keyword in keywords]
+            for category, keywords in self.categories.items()
+        }
+        
+        # 키워드 → 해당 키워드를 가진 카테고리 목록 (중복 포함)
+        self._keyword_categories = {}
+        for category, keywords in self._cats_lower.items():
+            for keyword in keywords:
+                if keyword:
+                    self._keyword_categories.setdefault(keyword, []).append(category)
+        
+        # pyahocorasick이 없으면 정규식 하나로 모든 키워드 검색
+        self._automaton = None
+        self._keyword_regex = None
+        if self._keyword_categories:
+            if AHOCORASICK_AVAILABLE:
+                self._automaton = self._build_automaton()
+            else:
+                self._keyword_regex, self._keyword_prefixes = self._build_regex()
+    
+    def _build_automaton(self):
+        """모든 카테고리 키워드로 Aho-Corasick 오토마톤 생성"""
+        automaton = ahocorasick.Automaton()
+        for keyword in self._keyword_categories:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _build_regex(self):
+        """
+        모든 키워드를 하나의 정규식 alternation으로 컴파일
         
+        전방탐색으로 모든 위치에서 가장 긴 키워드를 찾고, 같은 위치에서 시작하는
+        더 짧은 키워드(접두사)는 미리 계산한 목록으로 함께 집계합니다.
+        """
+        keywords = sorted(self._keyword_categories, key=len, reverse=True)
+        pattern = re.compile('(?=(' + '|'.join(map(re.escape, keywords)) + '))')
+        prefixes = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+        return pattern, prefixes
+    
+    def _score_categories(self, search_text):
+        """카테고리별 매칭된 키워드 수 계산"""
+        # 텍스트를 한 번만 훑으며 키워드별 첫 매칭만 집계
+        matched = set()
+        if self._automaton is not None:
+            for _, keyword in self._automaton.iter(search_text):
+                matched.add(keyword)
+        else:
+            for match in self._keyword_regex.finditer(search_text):
+                matched.update(self._keyword_prefixes[match.group(1)])
+        
+        counts = {}
+        for keyword in matched:
+            for category in self._keyword_categories[keyword]:
+                counts[category] = counts.get(category, 0) + 1
+        
+        # 동점일 때 설정 파일 순서를 따르도록 카테고리 순서로 재구성
+        return {cat: counts[cat] for cat in self._cats_lower if cat in counts}
+
     def categorize_video(self, video, transcript=None):
         """
         영상을 카테고리별로 분류
@@ -18,20 +88,18 @@ class VideoCategorizer:
         Returns:
             str: 카테고리명
         """
-        # 검색할 텍스트 준비
-        search_text = f"{video['title']} {video['description']}".lower()
+        # 분류 기준이 없으면 텍스트를 만들 필요 없음
+        if not self._keyword_categories:
+            return '기타'
         
-        # 자막이 있으면 추가
+        # 검색할 텍스트 준비 (자막이 있으면 앞부분 추가)
         if transcript and transcript.get('status') == 'success':
-            search_text += f" {transcript['text'][:500].lower()}"
+            search_text = f"{video['title']} {video['description']} {transcript['text'][:500]}".lower()
+        else:
+            search_text = (video['title'] + ' ' + video['description']).lower()
         
         # 카테고리별 키워드 매칭
-        category_scores = {}
-        
-        for category, keywords in self.categories.items():
-            score = sum(1 for keyword in keywords if keyword.lower() in search_text)
-            if score > 0:
-                category_scores[category] = score
+        category_scores = self._score_categories(search_text)
         
         # 가장 높은 점수의 카테고리 반환
         if category_scores:
@@ -50,27 +118,27 @@ class VideoCategorizer:
             transcripts: 자막 리스트 (선택)
         
         Returns:
-            dict: 카테고리별 영상 그룹
+            dict: 카테고리별 영상 그룹 (각 영상 dict에 'category' 필드가 추가됨)
         """
         categorized = {}
         
-        # 자막을 video_id로 매핑
+        # 자막을 video_id로 매핑 (분류에 쓰이는 성공한 자막만)
         transcript_map = {}
         if transcripts:
-            transcript_map = {t['video_id']: t for t in transcripts}
+            transcript_map = {
+                t['video_id']: t for t in transcripts
+                if t.get('status') == 'success'
+            }
+        
+        categorize_video = self.categorize_video
+        get_transcript = transcript_map.get
         
         for video in videos:
-            video_id = video['video_id']
-            transcript = transcript_map.get(video_id)
-            
-            category = self.categorize_video(video, transcript)
-            
-            if category not in categorized:
-                categorized[category] = []
+            category = categorize_video(video, get_transcript(video['video_id']))
             
-            video_with_category = video.copy()
-            video_with_category['category'] = category
-            categorized[category].append(video_with_category)
+            # 복사 없이 원본 영상 데이터에 카테고리 기록
+            video['category'] = category
+            categorized.setdefault(category, []).append(video)
         
         # 카테고리별 통계
         print("\n📊 카테고리별 분류 결과:")
@@ -118,15 +186,17 @@ class VideoCategorizer:
 
 
 if __name__ == "__main__":
-    import json
-    import yaml
+    import mmap
+    import orjson
+    from config_loader import load_config
     
     # 설정 및 데이터 로드
-    with open('config/config.yaml', 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config = load_config('config/config.yaml')
     
-    with open('data/likes_raw.json', 'r', encoding='utf-8') as f:
-        videos = json.load(f)
+    # 파일을 메모리 매핑해 별도 읽기 버퍼 없이 바로 파싱
+    with open('data/likes_raw.json', 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        videos = orjson.loads(memoryview(data))
     
     # 분류 실행
     categorizer = VideoCategorizer(config)
@@ -0,0 +1,25 @@
+"""
+설정 파일(YAML) 로드 모듈
+"""
+import os
+from functools import lru_cache
+import yaml
+
+# libyaml C 확장이 있으면 사용 (순수 Python 파서보다 훨씬 빠름)
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@lru_cache(maxsize=8)
+def _load_config(path, mtime):
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+def load_config(config_path='config/config.yaml'):
+    """
+    설정 파일 로드 (파일 수정 시각 기준 캐시)
+    
+    같은 파일을 여러 번 로드해도 파일이 바뀌지 않았다면 한 번만 파싱합니다.
+    반환된 설정은 여러 모듈이 공유하므로 읽기 전용으로 사용하세요.
+    """
+    return _load_config(config_path, os.path.getmtime(config_path))
@@ -2,179 +2,49 @@
 요약 리포트 생성 모듈 (Markdown, Excel, HTML) - PWA 지원 버전
 """
 import os
-import json
+import re
+import orjson
+from html import escape
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from operator import itemgetter
+from types import SimpleNamespace
 from zoneinfo import ZoneInfo
-import pandas as pd
+import xlsxwriter
 
-class ReportGenerator:
-    def __init__(self):
-        self.output_dir = 'outputs'
-        os.makedirs(self.output_dir, exist_ok=True)
-    
-    def generate_markdown_report(self, summaries, categorized_videos, filename=None):
-        """Markdown 형식 일일 요약 리포트 생성"""
-        if not filename:
-            filename = f"{datetime.now(ZoneInfo('Asia/Seoul')).strftime('%Y%m%d')}_summary.md"
-        
-        filepath = os.path.join(self.output_dir, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            # 헤더
-            f.write(f"# YouTube 좋아요 영상 요약\n\n")
-            f.write(f"**생성일시**: {datetime.now(ZoneInfo('Asia/Seoul')).strftime('%Y년 %m월 %d일 %H:%M')}\n\n")
-            f.write(f"**총 영상 수**: {len(summaries)}개\n\n")
-            
-            # 카테고리별 통계
-            f.write("## 📊 카테고리별 분포\n\n")
-            for category, videos in sorted(categorized_videos.items()):
-                f.write(f"- **{category}**: {len(videos)}개\n")
-            f.write("\n---\n\n")
-            
-            # 성공한 요약이 없으면 메시지 출력
-            success_summaries = [s for s in summaries if s.get('status') == 'success']
-            
-            if not success_summaries:
-                f.write("## ⚠️ 알림\n\n")
-                f.write("자막을 추출할 수 있는 영상이 없었습니다.\n")
-                f.write("- 일부 영상은 자막이 비활성화되어 있거나 자막이 제공되지 않습니다.\n")
-                f.write("- 자막이 있는 영상을 좋아요에 추가하시면 다음 실행 시 요약됩니다.\n\n")
-            else:
-                # 카테고리별 요약
-                for category in sorted(categorized_videos.keys()):
-                    f.write(f"## 📁 {category}\n\n")
-                    
-                    category_summaries = [
-                        s for s in summaries 
-                        if s['status'] == 'success' and 
-                        any(v['video_id'] == s['video_id'] for v in categorized_videos[category])
-                    ]
-                    
-                    for i, summary in enumerate(category_summaries, 1):
-                        f.write(f"### {i}. {summary['video_title']}\n\n")
-                        f.write(f"**채널**: {summary['channel']}  \n")
-                        f.write(f"**링크**: [{summary['video_url']}]({summary['video_url']})  \n")
-                        f.write(f"**유형**: {'영어학습' if summary['type'] == 'english_learning' else '일반'}\n\n")
-                        f.write(f"{summary['summary']}\n\n")
-                        f.write("---\n\n")
-                
-                # 영어 학습 영상 별도 섹션
-                english_summaries = [s for s in summaries if s.get('type') == 'english_learning' and s['status'] == 'success']
-                
-                if english_summaries:
-                    f.write("## 📚 영어 학습 콘텐츠 (복습용)\n\n")
-                    f.write("*반복 학습을 위해 영어 학습 콘텐츠를 별도로 정리했습니다.*\n\n")
-                    
-                    for i, summary in enumerate(english_summaries, 1):
-                        f.write(f"### {i}. {summary['video_title']}\n\n")
-                        f.write(f"[영상 보기]({summary['video_url']})\n\n")
-                        f.write(f"{summary['summary']}\n\n")
-                        f.write("---\n\n")
-        
-        print(f"✅ Markdown 리포트 생성 완료: {filepath}")
-        return filepath
-    
-    def generate_excel_report(self, summaries, categorized_videos, filename=None):
-        """Excel 형식 학습 데이터베이스 생성"""
-        if not filename:
-            filename = f"{datetime.now(ZoneInfo('Asia/Seoul')).strftime('%Y%m%d')}_youtube_summaries.xlsx"
-        
-        filepath = os.path.join(self.output_dir, filename)
-        
-        # 성공한 요약만 필터링
-        success_summaries = [s for s in summaries if s.get('status') == 'success']
-        
-        if not success_summaries:
-            print("⚠️  요약된 영상이 없어 Excel 파일을 생성하지 않습니다.")
-            return None
-        
-        # 데이터 준비
-        data = []
-        
-        # 카테고리 정보 매핑
-        video_categories = {}
-        for category, videos in categorized_videos.items():
-            for video in videos:
-                video_categories[video['video_id']] = category
-        
-        for summary in success_summaries:
-            data.append({
-                '카테고리': video_categories.get(summary['video_id'], '기타'),
-                '제목': summary['video_title'],
-                '채널': summary['channel'],
-                'URL': summary['video_url'],
-                '유형': '영어학습' if summary['type'] == 'english_learning' else '일반',
-                '요약': summary['summary'],
-                '수집일시': datetime.now(ZoneInfo('Asia/Seoul')).strftime('%Y-%m-%d %H:%M')
-            })
-        
-        # DataFrame 생성
-        df = pd.DataFrame(data)
-        
-        # Excel 저장
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            # 전체 시트
-            df.to_excel(writer, sheet_name='전체', index=False)
-            
-            # 카테고리별 시트
-            for category in df['카테고리'].unique():
-                category_df = df[df['카테고리'] == category]
-                sheet_name = category[:31]  # Excel 시트명 길이 제한
-                category_df.to_excel(writer, sheet_name=sheet_name, index=False)
-            
-            # 영어 학습 전용 시트
-            english_df = df[df['유형'] == '영어학습']
-            if not english_df.empty:
-                english_df.to_excel(writer, sheet_name='영어학습_복습용', index=False)
-        
-        print(f"✅ Excel 리포트 생성 완료: {filepath}")
-        return filepath
-    
-    def generate_html_report(self, summaries, categorized_videos, filename=None):
-        """HTML 웹페이지 리포트 생성 (PWA 지원)"""
-        if not filename:
-            filename = f"{datetime.now(ZoneInfo('Asia/Seoul')).strftime('%Y%m%d')}_summary.html"
-        
-        filepath = os.path.join(self.output_dir, filename)
-        
-        # 성공한 요약만 필터링
-        success_summaries = [s for s in summaries if s.get('status') == 'success']
-        
-        # 통계 계산
-        total_videos = len(success_summaries)
-        english_count = len([s for s in success_summaries if s.get('type') == 'english_learning'])
-        whisper_count = len([s for s in success_summaries if s.get('method') == 'whisper'])
-        
-        # 카테고리별 영상 매핑
-        video_categories = {}
-        for category, videos in categorized_videos.items():
-            for video in videos:
-                video_categories[video['video_id']] = category
-        
-        # HTML 생성 (PWA 지원 포함)
-        html_content = self._generate_html_template_with_pwa(
-            success_summaries, 
-            categorized_videos,
-            total_videos,
-            english_count,
-            whisper_count
-        )
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"✅ HTML 리포트 생성 완료 (PWA 지원): {filepath}")
-        print(f"   웹브라우저로 열기: {filepath}")
-        return filepath
-    
-    def _generate_html_template_with_pwa(self, summaries, categorized_videos, total, english, whisper):
-        """PWA 지원이 포함된 HTML 템플릿 생성"""
-        current_time = datetime.now(ZoneInfo('Asia/Seoul'))
-        date_str = current_time.strftime('%Y.%m.%d')
-        datetime_str = current_time.strftime('%Y년 %m월 %d일 %H:%M')
-        footer_datetime = current_time.strftime('%Y-%m-%d %H:%M:%S')
-        
-        html = f'''<!DOCTYPE html>
+# Rust 기반 Excel writer (선택사항, 설치되어 있으면 xlsxwriter 대신 사용)
+try:
+    from rustpy_xlsxwriter import FastExcel
+    FASTEXCEL_AVAILABLE = True
+except ImportError:
+    FASTEXCEL_AVAILABLE = False
+
+# 한국 표준시 (매 호출마다 생성하지 않도록 모듈에서 한 번만 생성)
+KST = ZoneInfo('Asia/Seoul')
+
+# Excel 행 구성에 필요한 요약 필드 (video_id는 카테고리 조회용)
+_EXCEL_FIELDS = itemgetter('video_id', 'video_title', 'channel', 'video_url', 'summary')
+
+# Excel 시트 열 순서
+_EXCEL_COLUMNS = ('카테고리', '제목', '채널', 'URL', '유형', '요약', '수집일시')
+
+# Excel 시트명 제약: 31자 이하, []:*?/\ 사용 불가, 대소문자 구분 없이 중복 불가
+_SHEET_NAME_MAX = 31
+_INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+
+# 영상 카드 배지 (유형/인식 방식별로 미리 만들어 둔 마크업)
+_GENERAL_BADGE = '<span class="badge badge-general">일반</span>'
+_TYPE_BADGES = {
+    'english_learning': '<span class="badge badge-english">영어학습</span>',
+    'general': _GENERAL_BADGE
+}
+_METHOD_BADGES = {
+    'whisper': '<span class="badge badge-whisper">🎤 Whisper</span>'
+}
+
+# HTML 리포트 고정 블록 (실행마다 f-string을 다시 조립하지 않도록 모듈 로드 시 한 번만 생성)
+_HTML_HEAD_TEMPLATE = '''<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
@@ -198,63 +68,65 @@ class ReportGenerator:
     <link rel="icon" type="image/png" sizes="512x512" href="/youtube-likes-summary/icons/likesum-icon-512x512.png">
     
     <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
+'''
+
+_CSS_BLOCK = '''        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Malgun Gothic', sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             padding: 20px;
             line-height: 1.6;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 20px;
             padding: 40px;
             box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-        }}
-        h1 {{
+        }
+        h1 {
             color: #667eea;
             font-size: 2.5em;
             margin-bottom: 10px;
             text-align: center;
-        }}
-        .date {{
+        }
+        .date {
             text-align: center;
             color: #666;
             margin-bottom: 30px;
-        }}
-        .stats {{
+        }
+        .stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin: 30px 0;
-        }}
-        .stat-card {{
+        }
+        .stat-card {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 25px;
             border-radius: 15px;
             text-align: center;
             box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-        }}
-        .stat-number {{
+        }
+        .stat-number {
             font-size: 2.5em;
             font-weight: bold;
             margin-bottom: 5px;
-        }}
-        .stat-label {{
+        }
+        .stat-label {
             font-size: 0.9em;
             opacity: 0.9;
-        }}
-        .filter-buttons {{
+        }
+        .filter-buttons {
             display: flex;
             gap: 10px;
             flex-wrap: wrap;
             justify-content: center;
             margin: 30px 0;
-        }}
-        .filter-btn {{
+        }
+        .filter-btn {
             padding: 10px 20px;
             border: 2px solid #667eea;
             background: white;
@@ -263,19 +135,19 @@ class ReportGenerator:
             cursor: pointer;
             font-weight: bold;
             transition: all 0.3s;
-        }}
-        .filter-btn:hover {{
+        }
+        .filter-btn:hover {
             background: #667eea;
             color: white;
-        }}
-        .filter-btn.active {{
+        }
+        .filter-btn.active {
             background: #667eea;
             color: white;
-        }}
-        .category-section {{
+        }
+        .category-section {
             margin: 30px 0;
-        }}
-        .category-header {{
+        }
+        .category-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
@@ -283,100 +155,102 @@ class ReportGenerator:
             padding: 15px 20px;
             border-radius: 10px;
             margin-bottom: 20px;
-        }}
-        .category-title {{
+        }
+        .category-title {
             font-size: 1.5em;
             font-weight: bold;
             color: #667eea;
-        }}
-        .category-count {{
+        }
+        .category-count {
             background: #667eea;
             color: white;
             padding: 5px 15px;
             border-radius: 20px;
             font-size: 0.9em;
-        }}
-        .video-card {{
+        }
+        .video-card {
             background: white;
             border: 2px solid #e9ecef;
             border-radius: 15px;
             padding: 25px;
             margin-bottom: 20px;
             transition: all 0.3s;
-        }}
-        .video-card:hover {{
+        }
+        .video-card:hover {
             border-color: #667eea;
             box-shadow: 0 5px 20px rgba(102,126,234,0.2);
             transform: translateY(-2px);
-        }}
-        .video-header {{
+        }
+        .video-header {
             display: flex;
             justify-content: space-between;
             align-items: flex-start;
             margin-bottom: 15px;
-        }}
-        .video-title {{
+        }
+        .video-title {
             flex: 1;
             font-size: 1.3em;
             color: #2c3e50;
             margin-right: 15px;
-        }}
-        .video-title a {{
+        }
+        .video-title a {
             color: inherit;
             text-decoration: none;
-        }}
-        .video-title a:hover {{
+        }
+        .video-title a:hover {
             color: #667eea;
-        }}
-        .video-meta {{
+        }
+        .video-meta {
             color: #6c757d;
             margin-bottom: 15px;
             font-size: 0.95em;
-        }}
-        .video-meta a {{
+        }
+        .video-meta a {
             color: #667eea;
             text-decoration: none;
-        }}
-        .video-summary {{
+        }
+        .video-summary {
             color: #495057;
             line-height: 1.8;
             white-space: pre-wrap;
-        }}
-        .badge {{
+        }
+        .badge {
             display: inline-block;
             padding: 5px 12px;
             border-radius: 15px;
             font-size: 0.85em;
             font-weight: bold;
             margin-left: 5px;
-        }}
-        .badge-english {{
+        }
+        .badge-english {
             background: #e3f2fd;
             color: #1976d2;
-        }}
-        .badge-general {{
+        }
+        .badge-general {
             background: #f3e5f5;
             color: #7b1fa2;
-        }}
-        .badge-whisper {{
+        }
+        .badge-whisper {
             background: #fff3e0;
             color: #e65100;
-        }}
-        footer {{
+        }
+        footer {
             text-align: center;
             margin-top: 40px;
             padding-top: 20px;
             border-top: 2px solid #e9ecef;
             color: #666;
-        }}
-        @media (max-width: 768px) {{
-            .container {{ padding: 20px; }}
-            h1 {{ font-size: 1.8em; }}
-            .stats {{ grid-template-columns: 1fr; }}
-        }}
+        }
+        @media (max-width: 768px) {
+            .container { padding: 20px; }
+            h1 { font-size: 1.8em; }
+            .stats { grid-template-columns: 1fr; }
+        }
     </style>
 </head>
-<body>
+'''
+
+_HTML_BODY_HEADER_TEMPLATE = '''<body>
     <div class="container">
         <h1>🎬 YouTube 좋아요 요약</h1>
         <div class="date">생성일시: {datetime_str}</div>
@@ -395,7 +269,7 @@ class ReportGenerator:
                 <div class="stat-label">Whisper 음성 인식</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{len(categorized_videos)}</div>
+                <div class="stat-number">{category_count}</div>
                 <div class="stat-label">카테고리</div>
             </div>
         </div>
@@ -407,37 +281,363 @@ class ReportGenerator:
             <button class="filter-btn" onclick="filterVideos('whisper')">Whisper 인식</button>
         </div>
 '''
+
+_HTML_FOOTER_TEMPLATE = '''
+        <footer>
+            <p>Powered by Claude AI & Whisper | 생성: {footer_datetime}</p>
+        </footer>
+    </div>
+    
+'''
+
+_SCRIPT_BLOCK = '''    <!-- Service Worker 등록 -->
+    <script>
+        // Service Worker 등록
+        if ('serviceWorker' in navigator) {
+            window.addEventListener('load', () => {
+                navigator.serviceWorker.register('/youtube-likes-summary/service-worker.js')
+                    .then((registration) => {
+                        console.log('✅ Service Worker 등록 성공:', registration.scope);
+                    })
+                    .catch((error) => {
+                        console.log('❌ Service Worker 등록 실패:', error);
+                    });
+            });
+        }
+        
+        // 필터 기능
+        function filterVideos(type) {
+            document.querySelectorAll('.filter-btn').forEach(btn => {
+                btn.classList.remove('active');
+            });
+            event.target.classList.add('active');
+            
+            const cards = document.querySelectorAll('.video-card');
+            cards.forEach(card => {
+                if (type === 'all') {
+                    card.style.display = 'block';
+                } else if (type === 'english') {
+                    card.style.display = card.dataset.type === 'english_learning' ? 'block' : 'none';
+                } else if (type === 'general') {
+                    card.style.display = card.dataset.type === 'general' ? 'block' : 'none';
+                } else if (type === 'whisper') {
+                    card.style.display = card.dataset.method === 'whisper' ? 'block' : 'none';
+                }
+            });
+        }
+    </script>
+</body>
+</html>
+'''
+
+def _unique_sheet_names(names, reserved=()):
+    """
+    Excel에서 쓸 수 있는 서로 다른 시트명 목록 생성 (입력 순서 유지)
+    
+    사용할 수 없는 문자는 '_'로 바꾸고 31자로 자른 뒤,
+    앞 31자가 같거나 예약된 이름과 겹치면 '_2', '_3' ... 을 붙입니다.
+    """
+    used = {name.lower() for name in reserved}
+    result = []
+    
+    for name in names:
+        base = _INVALID_SHEET_CHARS.sub('_', name)[:_SHEET_NAME_MAX] or '_'
+        candidate = base
+        number = 2
+        while candidate.lower() in used:
+            suffix = f"_{number}"
+            candidate = base[:_SHEET_NAME_MAX - len(suffix)] + suffix
+            number += 1
+        
+        used.add(candidate.lower())
+        result.append(candidate)
+    
+    return result
+
+
+class ReportGenerator:
+    def __init__(self):
+        self.output_dir = 'outputs'
+        os.makedirs(self.output_dir, exist_ok=True)
+        # 출력 경로 접두사 (파일마다 os.path.join 정규화를 반복하지 않도록 미리 계산)
+        self._output_prefix = self.output_dir.rstrip(os.sep) + os.sep
+    
+    def _build_video_category_index(self, categorized_videos):
+        """video_id → 카테고리 매핑 (한 번만 생성해 재사용)"""
+        return {
+            video['video_id']: category
+            for category, videos in categorized_videos.items()
+            for video in videos
+        }
+    
+    def _partition(self, summaries):
+        """
+        요약 리스트를 한 번 훑어 리포트에 필요한 목록으로 분류
+        
+        호출자의 요약 dict(요약 모듈 캐시와 같은 객체)는 수정하지 않고,
+        빠진 키(status/type/method)는 기본값으로 읽습니다.
+        
+        Returns:
+            SimpleNamespace: total(전체 개수), success, english, whisper (성공한 요약 기준)
+        """
+        success, english, whisper = [], [], []
+        
+        for s in summaries:
+            if s.get('status') != 'success':
+                continue
+            
+            success.append(s)
+            if s.get('type', 'general') == 'english_learning':
+                english.append(s)
+            if s.get('method', 'youtube_api') == 'whisper':
+                whisper.append(s)
+        
+        return SimpleNamespace(total=len(summaries), success=success, english=english, whisper=whisper)
+    
+    def _group_by_category(self, summaries, video_categories):
+        """요약을 카테고리별로 분류 (분류되지 않은 영상은 제외, 입력 순서 유지)"""
+        by_category = defaultdict(list)
+        for summary in summaries:
+            category = video_categories.get(summary['video_id'])
+            if category is not None:
+                by_category[category].append(summary)
+        return by_category
+    
+    def generate_markdown_report(self, summaries, categorized_videos, filename=None, video_categories=None,
+                                 partition=None):
+        """Markdown 형식 일일 요약 리포트 생성"""
+        now = datetime.now(KST)
+        if not filename:
+            filename = f"{now.strftime('%Y%m%d')}_summary.md"
+        
+        filepath = self._output_prefix + filename
+        
+        # 조각을 모아 한 번에 기록
+        parts = []
+        append = parts.append
+        
+        # 헤더
+        append(f"# YouTube 좋아요 영상 요약\n\n")
+        append(f"**생성일시**: {now.strftime('%Y년 %m월 %d일 %H:%M')}\n\n")
+        append(f"**총 영상 수**: {len(summaries)}개\n\n")
+        
+        # 카테고리 정렬은 한 번만 수행 (통계/본문에서 재사용)
+        sorted_items = sorted(categorized_videos.items())
+        
+        # 카테고리별 통계
+        append("## 📊 카테고리별 분포\n\n")
+        for category, videos in sorted_items:
+            append(f"- **{category}**: {len(videos)}개\n")
+        append("\n---\n\n")
+        
+        # 성공한 요약이 없으면 메시지 출력
+        if partition is None:
+            partition = self._partition(summaries)
+        success_summaries = partition.success
+        
+        if not success_summaries:
+            append("## ⚠️ 알림\n\n")
+            append("자막을 추출할 수 있는 영상이 없었습니다.\n")
+            append("- 일부 영상은 자막이 비활성화되어 있거나 자막이 제공되지 않습니다.\n")
+            append("- 자막이 있는 영상을 좋아요에 추가하시면 다음 실행 시 요약됩니다.\n\n")
+        else:
+            if video_categories is None:
+                video_categories = self._build_video_category_index(categorized_videos)
+            by_category = self._group_by_category(success_summaries, video_categories)
+            
+            # 카테고리별 요약
+            for category, _ in sorted_items:
+                append(f"## 📁 {category}\n\n")
+                
+                for i, summary in enumerate(by_category[category], 1):
+                    append(f"### {i}. {summary['video_title']}\n\n")
+                    append(f"**채널**: {summary['channel']}  \n")
+                    append(f"**링크**: [{summary['video_url']}]({summary['video_url']})  \n")
+                    append(f"**유형**: {'영어학습' if summary.get('type', 'general') == 'english_learning' else '일반'}\n\n")
+                    append(f"{summary['summary']}\n\n")
+                    append("---\n\n")
+            
+            # 영어 학습 영상 별도 섹션
+            english_summaries = partition.english
+            
+            if english_summaries:
+                append("## 📚 영어 학습 콘텐츠 (복습용)\n\n")
+                append("*반복 학습을 위해 영어 학습 콘텐츠를 별도로 정리했습니다.*\n\n")
+                
+                for i, summary in enumerate(english_summaries, 1):
+                    append(f"### {i}. {summary['video_title']}\n\n")
+                    append(f"[영상 보기]({summary['video_url']})\n\n")
+                    append(f"{summary['summary']}\n\n")
+                    append("---\n\n")
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(''.join(parts))
+        
+        print(f"✅ Markdown 리포트 생성 완료: {filepath}")
+        return filepath
+    
+    def generate_excel_report(self, summaries, categorized_videos, filename=None, video_categories=None,
+                              partition=None):
+        """Excel 형식 학습 데이터베이스 생성"""
+        now = datetime.now(KST)
+        if not filename:
+            filename = f"{now.strftime('%Y%m%d')}_youtube_summaries.xlsx"
+        
+        filepath = self._output_prefix + filename
+        
+        # 성공한 요약만 필터링
+        if partition is None:
+            partition = self._partition(summaries)
+        success_summaries = partition.success
+        
+        if not success_summaries:
+            print("⚠️  요약된 영상이 없어 Excel 파일을 생성하지 않습니다.")
+            return None
+        
+        # 카테고리 정보 매핑
+        if video_categories is None:
+            video_categories = self._build_video_category_index(categorized_videos)
+        
+        # 수집일시는 모든 행이 같으므로 한 번만 계산
+        collected_at = now.strftime('%Y-%m-%d %H:%M')
+        
+        # 한 번 훑으며 전체/카테고리별(등장 순서 유지)/영어 학습 시트의 행을 함께 분류
+        rows = []
+        by_category = {}
+        english_rows = []
+        
+        # 행마다 필요한 필드를 한 번의 호출로 꺼냄
+        get_fields = _EXCEL_FIELDS
+        for summary in success_summaries:
+            video_id, title, channel, url, summary_text = get_fields(summary)
+            video_type = summary.get('type', 'general')
+            category = video_categories.get(video_id, '기타')
+            row = {
+                '카테고리': category,
+                '제목': title,
+                '채널': channel,
+                'URL': url,
+                '유형': '영어학습' if video_type == 'english_learning' else '일반',
+                '요약': summary_text,
+                '수집일시': collected_at
+            }
+            rows.append(row)
+            by_category.setdefault(category, []).append(row)
+            if video_type == 'english_learning':
+                english_rows.append(row)
+        
+        # 시트 구성: 전체 → 카테고리별 → 영어 학습 전용
+        # 고정 시트명을 먼저 예약하고, 카테고리 시트명은 겹치면 번호를 붙여 구분
+        fixed_names = ['전체', '영어학습_복습용'] if english_rows else ['전체']
+        category_names = _unique_sheet_names(by_category, reserved=fixed_names)
+        
+        sheets = [('전체', rows)]
+        sheets.extend(zip(category_names, by_category.values()))
+        if english_rows:
+            sheets.append(('영어학습_복습용', english_rows))
+        
+        # Excel 저장
+        if FASTEXCEL_AVAILABLE:
+            # Rust 기반 writer로 모든 시트를 한 번에 기록 (기본 constant-memory 모드)
+            writer = FastExcel(filepath, autofit=False)
+            for sheet_name, sheet_rows in sheets:
+                writer.sheet(sheet_name, sheet_rows)
+            writer.save()
+        else:
+            # 행을 순서대로 기록하므로 constant_memory 모드로 전체 워크북을 메모리에 두지 않음
+            workbook = xlsxwriter.Workbook(filepath, {'constant_memory': True})
+            header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+            
+            for sheet_name, sheet_rows in sheets:
+                worksheet = workbook.add_worksheet(sheet_name)
+                worksheet.write_row(0, 0, _EXCEL_COLUMNS, header_format)
+                for row_num, row in enumerate(sheet_rows, 1):
+                    worksheet.write_row(row_num, 0, tuple(row.values()))
+            
+            workbook.close()
+        
+        print(f"✅ Excel 리포트 생성 완료: {filepath}")
+        return filepath
+    
+    def generate_html_report(self, summaries, categorized_videos, filename=None, video_categories=None,
+                             partition=None):
+        """HTML 웹페이지 리포트 생성 (PWA 지원)"""
+        now = datetime.now(KST)
+        if not filename:
+            filename = f"{now.strftime('%Y%m%d')}_summary.html"
+        
+        filepath = self._output_prefix + filename
+        
+        if video_categories is None:
+            video_categories = self._build_video_category_index(categorized_videos)
+        
+        if partition is None:
+            partition = self._partition(summaries)
+        
+        by_category = self._group_by_category(partition.success, video_categories)
+        
+        # HTML 생성 (PWA 지원 포함)
+        html_content = self._generate_html_template_with_pwa(
+            by_category, 
+            categorized_videos,
+            now,
+            len(partition.success),
+            len(partition.english),
+            len(partition.whisper)
+        )
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        
+        print(f"✅ HTML 리포트 생성 완료 (PWA 지원): {filepath}")
+        print(f"   웹브라우저로 열기: {filepath}")
+        return filepath
+    
+    def _generate_html_template_with_pwa(self, by_category, categorized_videos, current_time, total, english, whisper):
+        """PWA 지원이 포함된 HTML 템플릿 생성"""
+        # 영상 제목/채널/요약은 외부 데이터이므로 HTML 이스케이프 (반복 호출용 로컬 바인딩)
+        esc = escape
+        
+        chunks = [
+            _HTML_HEAD_TEMPLATE.format(date_str=current_time.strftime('%Y.%m.%d')),
+            _CSS_BLOCK,
+            _HTML_BODY_HEADER_TEMPLATE.format_map({
+                'datetime_str': current_time.strftime('%Y년 %m월 %d일 %H:%M'),
+                'total': total,
+                'english': english,
+                'whisper': whisper,
+                'category_count': len(categorized_videos)
+            })
+        ]
         
         # 카테고리별 영상
         for category in sorted(categorized_videos.keys()):
-            category_summaries = [
-                s for s in summaries 
-                if any(v['video_id'] == s['video_id'] for v in categorized_videos[category])
-            ]
+            category_summaries = by_category[category]
             
             if not category_summaries:
                 continue
             
-            html += f'''
+            chunks.append(f'''
         <div class="category-section">
             <div class="category-header">
                 <div class="category-title">📁 {category}</div>
                 <div class="category-count">{len(category_summaries)}개</div>
             </div>
-'''
+''')
             
             for summary in category_summaries:
+                video_url = esc(summary['video_url'])
                 video_type = summary.get('type', 'general')
                 method = summary.get('method', 'youtube_api')
                 
-                type_badge = '<span class="badge badge-english">영어학습</span>' if video_type == 'english_learning' else '<span class="badge badge-general">일반</span>'
-                whisper_badge = '<span class="badge badge-whisper">🎤 Whisper</span>' if method == 'whisper' else ''
+                type_badge = _TYPE_BADGES.get(video_type, _GENERAL_BADGE)
+                whisper_badge = _METHOD_BADGES.get(method, '')
                 
-                html += f'''
+                chunks.append(f'''
             <div class="video-card" data-type="{video_type}" data-method="{method}">
                 <div class="video-header">
                     <h3 class="video-title">
-                        <a href="{summary['video_url']}" target="_blank">{summary['video_title']}</a>
+                        <a href="{video_url}" target="_blank">{esc(summary['video_title'])}</a>
                     </h3>
                     <div>
                         {type_badge}
@@ -445,116 +645,124 @@ class ReportGenerator:
                     </div>
                 </div>
                 <div class="video-meta">
-                    📺 {summary['channel']} | 🔗 <a href="{summary['video_url']}" target="_blank">영상 보기</a>
+                    📺 {esc(summary['channel'])} | 🔗 <a href="{video_url}" target="_blank">영상 보기</a>
                 </div>
-                <div class="video-summary">{summary['summary']}</div>
+                <div class="video-summary">{esc(summary['summary'])}</div>
             </div>
-'''
+''')
             
-            html += '''
+            chunks.append('''
         </div>
-'''
-        
-        html += f'''
-        <footer>
-            <p>Powered by Claude AI & Whisper | 생성: {footer_datetime}</p>
-        </footer>
-    </div>
-    
-    <!-- Service Worker 등록 -->
-    <script>
-        // Service Worker 등록
-        if ('serviceWorker' in navigator) {{
-            window.addEventListener('load', () => {{
-                navigator.serviceWorker.register('/youtube-likes-summary/service-worker.js')
-                    .then((registration) => {{
-                        console.log('✅ Service Worker 등록 성공:', registration.scope);
-                    }})
-                    .catch((error) => {{
-                        console.log('❌ Service Worker 등록 실패:', error);
-                    }});
-            }});
-        }}
+''')
         
-        // 필터 기능
-        function filterVideos(type) {{
-            document.querySelectorAll('.filter-btn').forEach(btn => {{
-                btn.classList.remove('active');
-            }});
-            event.target.classList.add('active');
-            
-            const cards = document.querySelectorAll('.video-card');
-            cards.forEach(card => {{
-                if (type === 'all') {{
-                    card.style.display = 'block';
-                }} else if (type === 'english') {{
-                    card.style.display = card.dataset.type === 'english_learning' ? 'block' : 'none';
-                }} else if (type === 'general') {{
-                    card.style.display = card.dataset.type === 'general' ? 'block' : 'none';
-                }} else if (type === 'whisper') {{
-                    card.style.display = card.dataset.method === 'whisper' ? 'block' : 'none';
-                }}
-            }});
-        }}
-    </script>
-</body>
-</html>
-'''
+        chunks.append(_HTML_FOOTER_TEMPLATE.format(footer_datetime=current_time.strftime('%Y-%m-%d %H:%M:%S')))
+        chunks.append(_SCRIPT_BLOCK)
         
-        return html
+        return ''.join(chunks)
     
-    def generate_review_schedule(self, summaries, days=[1, 3, 7, 14, 30]):
+    def generate_review_schedule(self, summaries, days=[1, 3, 7, 14, 30], partition=None):
         """복습 일정 생성"""
         schedule = {}
-        today = datetime.now(ZoneInfo('Asia/Seoul'))
+        today = datetime.now(KST)
         
-        english_summaries = [s for s in summaries if s.get('type') == 'english_learning' and s['status'] == 'success']
+        if partition is None:
+            partition = self._partition(summaries)
+        english_summaries = partition.english
         
         if not english_summaries:
             return {}
         
+        # 복습일마다 같은 영상 목록을 공유 (날짜별로 복사하지 않음)
+        videos = [(s['video_title'], s['video_url']) for s in english_summaries]
+        
         for day in days:
             review_date = (today + timedelta(days=day)).strftime('%Y-%m-%d')
-            schedule[review_date] = [
-                {
-                    'title': s['video_title'],
-                    'url': s['video_url'],
-                    'day': f"D+{day}"
-                }
-                for s in english_summaries
-            ]
+            schedule[review_date] = {'day': f"D+{day}", 'videos': videos}
+        
+        schedule_file = self._output_prefix + 'review_schedule.md'
+        
+        parts = ["# 📅 영어 학습 복습 일정\n\n", "*간격 반복 학습을 위한 복습 스케줄입니다.*\n\n"]
+        append = parts.append
         
-        schedule_file = os.path.join(self.output_dir, 'review_schedule.md')
+        # 영상 항목 줄은 모든 날짜에서 같으므로 한 번만 생성
+        video_lines = ''.join(f"- [ ] [{title}]({url})\n" for title, url in videos)
+        
+        for date in sorted(schedule.keys()):
+            append(f"## {date} ({schedule[date]['day']})\n\n")
+            append(video_lines)
+            append("\n")
         
         with open(schedule_file, 'w', encoding='utf-8') as f:
-            f.write("# 📅 영어 학습 복습 일정\n\n")
-            f.write("*간격 반복 학습을 위한 복습 스케줄입니다.*\n\n")
-            
-            for date in sorted(schedule.keys()):
-                videos = schedule[date]
-                f.write(f"## {date} ({videos[0]['day']})\n\n")
-                
-                for video in videos:
-                    f.write(f"- [ ] [{video['title']}]({video['url']})\n")
-                
-                f.write("\n")
+            f.write(''.join(parts))
         
         print(f"✅ 복습 일정 생성 완료: {schedule_file}")
         return schedule
     
-    def generate_statistics(self, summaries, categorized_videos):
+    def generate_statistics(self, summaries, categorized_videos, partition=None):
         """통계 정보 생성"""
+        if partition is None:
+            partition = self._partition(summaries)
+        
         stats = {
-            '총_영상_수': len(summaries),
-            '성공_요약_수': len([s for s in summaries if s.get('status') == 'success']),
-            '영어학습_콘텐츠': len([s for s in summaries if s.get('type') == 'english_learning']),
+            '총_영상_수': partition.total,
+            '성공_요약_수': len(partition.success),
+            '영어학습_콘텐츠': len(partition.english),
             '카테고리별_분포': {cat: len(vids) for cat, vids in categorized_videos.items()},
-            '생성일시': datetime.now(ZoneInfo('Asia/Seoul')).isoformat()
+            '생성일시': datetime.now(KST).isoformat()
         }
         
-        stats_file = os.path.join(self.output_dir, 'statistics.json')
-        with open(stats_file, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
+        stats_file = self._output_prefix + 'statistics.json'
+        with open(stats_file, 'wb') as f:
+            f.write(orjson.dumps(stats, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         print(f"✅ 통계 정보 저장: {stats_file}")
-        return stats
\ No newline at end of file
+        return stats
+    
+    def generate_all(self, summaries, categorized_videos, markdown=True, excel=True):
+        """
+        모든 리포트를 동시에 생성 (각 리포트는 서로 다른 파일에 기록)
+        
+        Args:
+            summaries: 요약 리스트
+            categorized_videos: 카테고리별 영상 그룹
+            markdown: Markdown 리포트 생성 여부
+            excel: Excel 리포트 생성 여부
+        
+        Returns:
+            list: 각 작업의 반환값 (제출 순서)
+        """
+        # 카테고리 매핑과 분류 결과는 한 번만 만들어 스레드 간 읽기 전용으로 공유
+        video_categories = self._build_video_category_index(categorized_videos)
+        partition = self._partition(summaries)
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = []
+            
+            if markdown:
+                futures.append(executor.submit(
+                    self.generate_markdown_report, summaries, categorized_videos,
+                    video_categories=video_categories,
+                    partition=partition
+                ))
+            
+            if excel:
+                futures.append(executor.submit(
+                    self.generate_excel_report, summaries, categorized_videos,
+                    video_categories=video_categories,
+                    partition=partition
+                ))
+            
+            futures.append(executor.submit(
+                self.generate_html_report, summaries, categorized_videos,
+                video_categories=video_categories,
+                partition=partition
+            ))
+            
+            # 복습 일정 (영어 학습 콘텐츠가 있을 때만)
+            if partition.english:
+                futures.append(executor.submit(self.generate_review_schedule, summaries, partition=partition))
+            
+            futures.append(executor.submit(self.generate_statistics, summaries, categorized_videos, partition=partition))
+            
+            # 작업 중 발생한 예외를 호출한 스레드로 전달
+            return [future.result() for future in futures]
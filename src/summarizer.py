@@ -2,16 +2,93 @@
 Claude API를 사용한 영상 요약 모듈
 """
 import os
-import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import orjson
 from anthropic import Anthropic
 
+# 묶음 요약의 영상당 출력 토큰과 요청 하나의 출력 토큰 상한
+# (8192는 Claude 3.5 이후 모델이 지원하는 출력 길이)
+_GROUP_TOKENS_PER_VIDEO = 1024
+_MAX_OUTPUT_TOKENS = 8192
+
+
 class VideoSummarizer:
+    # 한 번에 묶어 요약할 수 있는 최대 영상 수 (출력 토큰 상한 기준)
+    MAX_GROUP_SIZE = _MAX_OUTPUT_TOKENS // _GROUP_TOKENS_PER_VIDEO
+    
     def __init__(self, config):
         self.config = config
-        self.client = Anthropic(api_key=config['anthropic']['api_key'])
+        # 429(RateLimitError)/5xx 응답은 SDK가 지수 백오프로 재시도
+        self.client = Anthropic(
+            api_key=config['anthropic']['api_key'],
+            max_retries=config.get('performance', {}).get('llm_max_retries', 5)
+        )
         self.model = config['anthropic']['model']
         self.summaries_dir = 'data/summaries'
         os.makedirs(self.summaries_dir, exist_ok=True)
+        # 저장된 요약의 메타데이터 인덱스 (video_id → cache_key, 파일 mtime/크기)
+        # 요약 본문은 영상별 파일에만 두고, 키가 일치할 때만 파일을 읽음
+        self.index_path = os.path.join(self.summaries_dir, '_index.json')
+        self._summary_index = self._load_index()
+        # 이번 실행에서 생성했거나 파일에서 읽은 요약 (video_id → 요약 결과)
+        self._cache = {}
+    
+    def _excerpt(self, text, limit=4000):
+        """
+        토큰 제한에 맞춰 자막 일부만 사용
+        
+        긴 자막은 앞/뒤 절반씩 잘라 도입부와 결론을 함께 전달합니다.
+        """
+        if len(text) <= limit:
+            return text
+        half = limit // 2
+        return f"{text[:half]}\n...\n{text[-half:]}"
+    
+    def _cache_key(self, transcript, prompt_type):
+        """모델/프롬프트 종류/자막 내용이 같을 때만 일치하는 캐시 키"""
+        source = f"{transcript['video_id']}\0{self.model}\0{prompt_type}\0{transcript['text']}"
+        return hashlib.blake2b(source.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _get_cached(self, video_id, key, prompt_type):
+        """
+        같은 키로 저장된 요약이 있으면 반환 (API 호출 생략)
+        
+        cache_key가 없는 이전 버전의 요약은 요약 종류가 같고 모델이 기록되지 않았거나
+        현재 모델과 같으면 그대로 재사용하고, 계산한 키와 모델을 기록해 둡니다.
+        (이전 버전은 자막이 바뀌어도 저장된 요약을 재사용했으므로 같은 동작 유지)
+        """
+        summary = self._cache.get(video_id)
+        if summary is None:
+            # 인덱스의 키가 다르면 파일을 읽을 필요 없음 (키가 없는 이전 요약은 파일 확인)
+            entry = self._summary_index.get(video_id)
+            if entry is None or entry.get('cache_key') not in (key, None):
+                return None
+            summary = self.load_summary(video_id)
+        
+        if summary is None:
+            return None
+        if summary.get('cache_key') == key:
+            return summary
+        if (summary.get('cache_key') is None and summary.get('status') == 'success'
+                and summary.get('type') == prompt_type
+                and summary.get('model', self.model) == self.model):
+            summary['cache_key'] = key
+            summary['model'] = self.model
+            return summary
+        return None
+    
+    def get_cached_summary(self, transcript, prompt_type):
+        """
+        현재 모델/프롬프트 종류/자막 내용과 키가 같은 저장된 요약 반환 (없으면 None)
+        
+        Args:
+            transcript: 자막 데이터
+            prompt_type: 'general' 또는 'english_learning'
+        """
+        key = self._cache_key(transcript, prompt_type)
+        return self._get_cached(transcript['video_id'], key, prompt_type)
     
     def summarize_general(self, transcript):
         """일반 영상 요약"""
@@ -22,13 +99,18 @@ class VideoSummarizer:
                 'reason': '자막 없음'
             }
         
+        key = self._cache_key(transcript, 'general')
+        cached = self._get_cached(transcript['video_id'], key, 'general')
+        if cached is not None:
+            return cached
+        
         prompt = f"""다음은 YouTube 영상의 자막입니다.
 
 제목: {transcript['video_title']}
 채널: {transcript['channel']}
 
 자막:
-{transcript['text'][:4000]}  # 토큰 제한을 위해 앞부분만 사용
+{self._excerpt(transcript['text'])}
 
 위 영상의 핵심 내용을 3-5줄로 요약해주세요. 주요 포인트와 핵심 메시지를 중심으로 간결하게 작성해주세요."""
 
@@ -44,15 +126,19 @@ class VideoSummarizer:
             
             summary = message.content[0].text
             
-            return {
+            result = {
                 'video_id': transcript['video_id'],
                 'video_title': transcript['video_title'],
                 'video_url': transcript['video_url'],
                 'channel': transcript['channel'],
                 'type': 'general',
                 'summary': summary,
-                'status': 'success'
+                'status': 'success',
+                'model': self.model,
+                'cache_key': key
             }
+            self._cache[transcript['video_id']] = result
+            return result
             
         except Exception as e:
             print(f"❌ 요약 실패: {transcript['video_id']} - {str(e)}")
@@ -71,13 +157,18 @@ class VideoSummarizer:
                 'reason': '자막 없음'
             }
         
+        key = self._cache_key(transcript, 'english_learning')
+        cached = self._get_cached(transcript['video_id'], key, 'english_learning')
+        if cached is not None:
+            return cached
+        
         prompt = f"""다음은 영어 학습 YouTube 영상의 자막입니다.
 
 제목: {transcript['video_title']}
 채널: {transcript['channel']}
 
 자막:
-{transcript['text'][:4000]}
+{self._excerpt(transcript['text'])}
 
 위 영상을 분석하여 다음 형식으로 정리해주세요:
 
@@ -100,15 +191,19 @@ class VideoSummarizer:
             
             summary = message.content[0].text
             
-            return {
+            result = {
                 'video_id': transcript['video_id'],
                 'video_title': transcript['video_title'],
                 'video_url': transcript['video_url'],
                 'channel': transcript['channel'],
                 'type': 'english_learning',
                 'summary': summary,
-                'status': 'success'
+                'status': 'success',
+                'model': self.model,
+                'cache_key': key
             }
+            self._cache[transcript['video_id']] = result
+            return result
             
         except Exception as e:
             print(f"❌ 영어 학습 요약 실패: {transcript['video_id']} - {str(e)}")
@@ -118,6 +213,91 @@ class VideoSummarizer:
                 'error': str(e)
             }
     
+    def summarize_general_group(self, transcripts):
+        """
+        일반 영상 여러 개를 한 번의 API 호출로 요약
+        
+        공통 지시문을 한 번만 보내 요청 수와 프롬프트 토큰을 줄입니다.
+        같은 키로 저장된 요약이 있는 영상은 요청에서 제외하며,
+        응답을 해석할 수 없으면 영상별로 summarize_general을 호출합니다.
+        
+        Args:
+            transcripts: 자막 추출에 성공한 일반 영상 자막 리스트
+        
+        Returns:
+            list: 입력 순서와 같은 요약 결과 리스트
+        """
+        results = [None] * len(transcripts)
+        keys = {}
+        
+        # 같은 키로 저장된 요약이 있는 영상은 묶음에서 제외
+        for i, transcript in enumerate(transcripts):
+            key = self._cache_key(transcript, 'general')
+            cached = self._get_cached(transcript['video_id'], key, 'general')
+            if cached is not None:
+                results[i] = cached
+            else:
+                keys[i] = key
+        
+        if not keys:
+            return results
+        
+        pending = [transcripts[i] for i in keys]
+        
+        sections = []
+        for i, transcript in enumerate(pending, 1):
+            sections.append(f"""[{i}]
+제목: {transcript['video_title']}
+채널: {transcript['channel']}
+
+자막:
+{self._excerpt(transcript['text'])}""")
+        
+        prompt = f"""다음은 YouTube 영상 {len(pending)}개의 자막입니다.
+
+{chr(10).join(sections)}
+
+각 영상의 핵심 내용을 3-5줄로 요약해주세요. 주요 포인트와 핵심 메시지를 중심으로 간결하게 작성해주세요.
+결과는 영상 순서대로 요약 {len(pending)}개를 담은 JSON 문자열 배열로만 답해주세요. 예: ["1번 영상 요약", "2번 영상 요약"]"""
+
+        try:
+            message = self.client.messages.create(
+                model=self.model,
+                max_tokens=min(_GROUP_TOKENS_PER_VIDEO * len(pending), _MAX_OUTPUT_TOKENS),
+                messages=[{
+                    "role": "user",
+                    "content": prompt
+                }]
+            )
+            
+            text = message.content[0].text
+            summaries = orjson.loads(text[text.index('['):text.rindex(']') + 1])
+            
+            if len(summaries) != len(pending) or not all(isinstance(s, str) for s in summaries):
+                raise ValueError(f"요약 개수 불일치 ({len(summaries)}/{len(pending)})")
+            
+        except Exception as e:
+            print(f"⚠️  묶음 요약 실패, 개별 요약으로 전환: {str(e)}")
+            for i in keys:
+                results[i] = self.summarize_general(transcripts[i])
+            return results
+        
+        for (i, key), summary in zip(keys.items(), summaries):
+            transcript = transcripts[i]
+            results[i] = self._cache[transcript['video_id']] = {
+                'video_id': transcript['video_id'],
+                'video_title': transcript['video_title'],
+                'video_url': transcript['video_url'],
+                'channel': transcript['channel'],
+                'type': 'general',
+                'summary': summary,
+                'status': 'success',
+                'model': self.model,
+                'cache_key': key
+            }
+        
+        return results
+    
     def summarize_batch(self, transcripts, is_english_learning_func):
         """
         여러 영상 일괄 요약
@@ -129,61 +309,148 @@ class VideoSummarizer:
         Returns:
             list: 요약 결과 리스트
         """
-        summaries = []
+        if not transcripts:
+            return []
         
-        for i, transcript in enumerate(transcripts, 1):
-            print(f"\n[{i}/{len(transcripts)}] 요약 생성 중: {transcript.get('video_title', 'Unknown')[:50]}...")
-            
-            # 영어 학습 콘텐츠 판단
-            if is_english_learning_func(transcript):
-                print("  → 영어 학습 콘텐츠로 분류")
-                summary = self.summarize_english_learning(transcript)
-            else:
-                print("  → 일반 콘텐츠로 분류")
-                summary = self.summarize_general(transcript)
+        summaries = [None] * len(transcripts)
+        print_lock = threading.Lock()
+        
+        def summarize_one(transcript):
+            # 영어 학습 콘텐츠 판단 (main 파이프라인과 같이 결과를 자막 데이터에 기록해 재사용)
+            if 'is_english' not in transcript:
+                transcript['is_english'] = is_english_learning_func(transcript)
             
-            summaries.append(summary)
+            if transcript['is_english']:
+                return 'english', self.summarize_english_learning(transcript)
+            return 'general', self.summarize_general(transcript)
+        
+        # 네트워크 대기가 대부분이므로 스레드로 동시에 요청
+        max_workers = min(self.config.get('performance', {}).get('llm_concurrency', 4), len(transcripts))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(summarize_one, transcript): i
+                for i, transcript in enumerate(transcripts)
+            }
             
-            if summary['status'] == 'success':
-                print(f"  ✅ 요약 완료")
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                kind, summary = future.result()
+                summaries[i] = summary
+                
+                with print_lock:
+                    print(f"\n[{done}/{len(transcripts)}] 요약 생성: {transcripts[i].get('video_title', 'Unknown')[:50]}...")
+                    print("  → 영어 학습 콘텐츠로 분류" if kind == 'english' else "  → 일반 콘텐츠로 분류")
+                    if summary['status'] == 'success':
+                        print(f"  ✅ 요약 완료")
         
         print(f"\n✅ 총 {len([s for s in summaries if s['status'] == 'success'])}개 요약 생성 완료")
         return summaries
     
     def save_summaries(self, summaries):
-        """요약 결과 저장"""
+        """요약 결과 저장 (영상별 파일 + 인덱스 파일 한 번 갱신)"""
+        saved = False
+        
         for summary in summaries:
             if summary['status'] == 'success':
                 video_id = summary['video_id']
                 filepath = os.path.join(self.summaries_dir, f"{video_id}_summary.json")
                 
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(summary, f, ensure_ascii=False, indent=2)
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+                
+                self._cache[video_id] = summary
+                self._summary_index[video_id] = self._index_entry(summary, os.stat(filepath))
+                saved = True
+        
+        if saved:
+            self._save_index()
         
         print(f"✅ 요약 파일 저장 완료: {self.summaries_dir}")
     
-    def load_summary(self, video_id):
-        """저장된 요약 로드"""
-        filepath = os.path.join(self.summaries_dir, f"{video_id}_summary.json")
+    @staticmethod
+    def _index_entry(summary, stat):
+        """인덱스에 기록할 메타데이터 (파일이 바뀌었는지 mtime/크기로 판단)"""
+        return {
+            'cache_key': summary.get('cache_key'),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size
+        }
+    
+    def _load_index(self):
+        """
+        인덱스 파일 로드
         
-        if not os.path.exists(filepath):
-            return None
+        영상별 요약 파일이 기준이며, 인덱스와 mtime/크기가 다른 파일(새로 생기거나
+        직접 수정된 파일)만 다시 읽어 반영합니다. 바뀐 것이 있을 때만 인덱스를 다시 씁니다.
+        """
+        suffix = '_summary.json'
+        
+        index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as f:
+                index = orjson.loads(f.read())
+        
+        fresh = {}
+        changed = False
+        with os.scandir(self.summaries_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(suffix) or not entry.is_file():
+                    continue
+                
+                video_id = entry.name[:-len(suffix)]
+                stat = entry.stat()
+                known = index.get(video_id)
+                if known and known.get('mtime_ns') == stat.st_mtime_ns and known.get('size') == stat.st_size:
+                    fresh[video_id] = known
+                    continue
+                
+                with open(entry.path, 'rb') as f:
+                    fresh[video_id] = self._index_entry(orjson.loads(f.read()), stat)
+                changed = True
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # 파일이 삭제된 요약이 있어도 다시 기록
+        if changed or len(fresh) != len(index):
+            self._save_index(fresh)
+        
+        return fresh
+    
+    def _save_index(self, index=None):
+        """인덱스 파일 기록"""
+        with open(self.index_path, 'wb') as f:
+            f.write(orjson.dumps(
+                self._summary_index if index is None else index,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ))
+    
+    def list_cached_ids(self):
+        """저장된 요약이 있는 video_id 집합"""
+        return set(self._summary_index)
+    
+    def load_summary(self, video_id):
+        """저장된 요약 로드 (처음 요청될 때 영상별 파일에서 읽음)"""
+        summary = self._cache.get(video_id)
+        if summary is None and video_id in self._summary_index:
+            filepath = os.path.join(self.summaries_dir, f"{video_id}_summary.json")
+            try:
+                with open(filepath, 'rb') as f:
+                    summary = orjson.loads(f.read())
+            except FileNotFoundError:
+                return None
+            self._cache[video_id] = summary
+        return summary
 
 
 if __name__ == "__main__":
-    import yaml
+    from config_loader import load_config
     from transcript_extractor import TranscriptExtractor
     
     # 설정 로드
-    with open('config/config.yaml', 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config = load_config('config/config.yaml')
     
     # 자막 로드
-    with open('data/likes_raw.json', 'r', encoding='utf-8') as f:
-        videos = json.load(f)
+    with open('data/likes_raw.json', 'rb') as f:
+        videos = orjson.loads(f.read())
     
     extractor = TranscriptExtractor()
     transcripts = extractor.extract_multiple(videos[:3])  # 테스트용 3개
@@ -2,17 +2,119 @@
 YouTube 영상 자막 추출 모듈 (Whisper 음성 인식 통합)
 """
 import os
-import json
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
+import re
+import gc
+import orjson
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+from youtube_transcript_api._transcripts import TranscriptListFetcher
+from youtube_transcript_api._errors import (
+    TranscriptsDisabled, NoTranscriptFound, TooManyRequests, YouTubeRequestFailed
+)
 
-# Whisper 관련 import (선택사항)
+# Whisper 관련 import (선택사항, faster-whisper 우선 / 없으면 openai-whisper)
 try:
     import yt_dlp
-    import whisper
+    try:
+        from faster_whisper import WhisperModel
+        WHISPER_BACKEND = 'faster_whisper'
+    except ImportError:
+        import whisper
+        WHISPER_BACKEND = 'openai_whisper'
     WHISPER_AVAILABLE = True
 except ImportError:
     WHISPER_AVAILABLE = False
+    WHISPER_BACKEND = None
+
+# 자막 요청 재시도 (요청 제한/일시적 네트워크 오류만, 2초부터 두 배씩 최대 30초 대기)
+_TRANSCRIPT_MAX_ATTEMPTS = 4
+_TRANSCRIPT_RETRY_MAX_WAIT = 30
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# 저장된 자막 파일 접미사 (method → 접미사)
+_TRANSCRIPT_SUFFIXES = {'youtube_api': '_youtube_api.json', 'whisper': '_whisper.json'}
+
+# 영어 학습 콘텐츠 판별용 제목 키워드
+_ENGLISH_KEYWORD_RE = re.compile(r'english|영어|toeic|speaking|grammar|vocabulary', re.IGNORECASE)
+
+
+def _is_retryable(error):
+    """YouTubeRequestFailed는 429/5xx 응답일 때만 재시도 (404 등은 다시 요청해도 같음)"""
+    if isinstance(error, YouTubeRequestFailed):
+        response = getattr(error.__context__, 'response', None)
+        return response is not None and response.status_code in _RETRYABLE_STATUS
+    return True
+
+
+class _WhisperManager:
+    """
+    Whisper 모델을 프로세스 전체에서 공유 (처음 필요할 때 한 번만 로드)
+    
+    모든 영상에 YouTube 자막이 있으면 모델을 아예 로드하지 않으며,
+    여러 TranscriptExtractor 인스턴스도 같은 크기의 모델을 재사용합니다.
+    """
+    _models = {}
+    _lock = threading.Lock()
+    # 공유 모델은 스레드 간 동시 추론이 안전하지 않으므로 transcribe 호출을 직렬화
+    inference_lock = threading.Lock()
+    
+    @staticmethod
+    def _detect_device():
+        """
+        추론 장치 선택 (CUDA GPU가 있으면 cuda, 없으면 cpu)
+        
+        GPU 사용 시 CUDA 빌드 PyTorch가 필요합니다. 예:
+            pip install --force-reinstall torch --index-url https://download.pytorch.org/whl/cu118
+        """
+        if WHISPER_BACKEND == 'faster_whisper':
+            # faster-whisper는 torch 없이 CTranslate2로 GPU를 확인
+            try:
+                import ctranslate2
+                return 'cuda' if ctranslate2.get_cuda_device_count() > 0 else 'cpu'
+            except Exception:
+                return 'cpu'
+        
+        try:
+            import torch
+            return 'cuda' if torch.cuda.is_available() else 'cpu'
+        except ImportError:
+            return 'cpu'
+    
+    @classmethod
+    def get(cls, size):
+        """크기별 모델 반환 (없으면 로드)"""
+        with cls._lock:
+            model = cls._models.get(size)
+            if model is None:
+                device = cls._detect_device()
+                print(f"  📦 Whisper 모델 로드 중: {size} ({device})")
+                if WHISPER_BACKEND == 'faster_whisper':
+                    # GPU는 FP16, CPU는 INT8 (CPU에서 openai-whisper보다 빠르고 메모리 사용량이 적음)
+                    compute_type = 'float16' if device == 'cuda' else 'int8'
+                    model = WhisperModel(size, device=device, compute_type=compute_type)
+                else:
+                    # openai-whisper는 CUDA에서 FP16으로 추론 (CPU에서는 FP32)
+                    model = whisper.load_model(size, device=device)
+                cls._models[size] = model
+            return model
+    
+    @classmethod
+    def unload(cls):
+        """로드된 모델 해제 (장시간 실행되는 프로세스용)"""
+        with cls._lock:
+            cls._models.clear()
+        gc.collect()
+        
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
 
 class TranscriptExtractor:
     def __init__(self, use_whisper=False, whisper_model='base'):
@@ -28,16 +130,29 @@ class TranscriptExtractor:
         os.makedirs(self.transcript_dir, exist_ok=True)
         os.makedirs(self.audio_dir, exist_ok=True)
         
+        # 이미 받아둔 오디오/자막 파일 (video_id → 경로), 영상마다 디렉토리를 조회하지 않도록 한 번만 스캔
+        self._audio_files = self._scan_audio_files()
+        self._transcript_files = self._scan_transcript_files()
+        
         self.use_whisper = use_whisper and WHISPER_AVAILABLE
         
+        # 자막 요청은 하나의 세션을 재사용해 영상마다 TCP/TLS 연결을 새로 맺지 않음
+        # (YouTubeTranscriptApi.list_transcripts는 호출마다 새 세션을 만듦)
+        self._http = requests.Session()
+        self._http.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32))
+        # Whisper 모델은 인스턴스 간에도 공유되므로 추론은 프로세스 전체에서 직렬화
+        self._whisper_lock = _WhisperManager.inference_lock
+        
+        # 모델은 자막이 없는 영상을 처음 만났을 때 로드
+        self._whisper_size = whisper_model
+        
         if self.use_whisper:
             print("🎤 Whisper 음성 인식 모드 활성화")
-            self.whisper_model = whisper.load_model(whisper_model)
         elif use_whisper and not WHISPER_AVAILABLE:
             print("⚠️  Whisper 패키지가 설치되지 않았습니다.")
-            print("   설치: pip install openai-whisper yt-dlp")
+            print("   설치: pip install faster-whisper yt-dlp")
     
-    def extract_transcript(self, video_id, url=None, languages=['ko', 'en']):
+    def extract_transcript(self, video_id, url=None, languages=['ko', 'en'], ignore_cache=False):
         """
         영상의 자막 추출 (자막 없으면 Whisper 사용)
         
@@ -45,18 +160,25 @@ class TranscriptExtractor:
             video_id: YouTube 영상 ID
             url: YouTube 영상 URL (Whisper 사용 시 필요)
             languages: 선호 언어 리스트
+            ignore_cache: True면 저장된 자막을 무시하고 다시 추출
         
         Returns:
             dict: 자막 텍스트와 메타데이터
         """
+        # 0단계: 이전 실행에서 저장한 자막이 있으면 네트워크 요청 생략
+        if not ignore_cache:
+            cached = self.load_transcript(video_id)
+            if cached and cached.get('status') == 'success':
+                return cached
+        
         # 1단계: YouTube 자막 시도
         transcript = self._extract_youtube_transcript(video_id, languages)
         
         if transcript['status'] == 'success':
             return transcript
         
-        # 2단계: 자막 없으면 Whisper 시도
-        if self.use_whisper and url:
+        # 2단계: 자막 없으면 Whisper 시도 (요청 제한은 자막이 있을 수 있으므로 제외)
+        if self.use_whisper and url and transcript['status'] != 'rate_limited':
             print(f"  ℹ️  자막 없음 → Whisper 음성 인식 시도")
             return self._extract_with_whisper(video_id, url)
         
@@ -68,26 +190,25 @@ class TranscriptExtractor:
             transcript_data = None
             language_used = None
             
+            # 자막 목록은 한 번만 요청하고 언어 선택은 로컬에서 처리
+            transcript_list = self._with_retry(TranscriptListFetcher(self._http).fetch, video_id)
+            
             for lang in languages:
                 try:
-                    transcript_data = YouTubeTranscriptApi.get_transcript(
-                        video_id, 
-                        languages=[lang]
-                    )
-                    language_used = lang
-                    break
-                except (NoTranscriptFound, Exception):
+                    # 같은 언어면 수동 자막을 자동 생성 자막보다 우선
+                    transcript = transcript_list.find_transcript([lang])
+                except NoTranscriptFound:
                     continue
+                transcript_data = self._with_retry(transcript.fetch)
+                language_used = lang
+                break
             
             if not transcript_data:
-                try:
-                    transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-                    for transcript in transcript_list:
-                        transcript_data = transcript.fetch()
-                        language_used = transcript.language_code
-                        break
-                except Exception:
-                    pass
+                # 선호 언어가 없으면 목록의 첫 번째 자막 사용
+                for transcript in transcript_list:
+                    transcript_data = self._with_retry(transcript.fetch)
+                    language_used = transcript.language_code
+                    break
             
             if transcript_data:
                 full_text = ' '.join([entry['text'] for entry in transcript_data])
@@ -117,6 +238,19 @@ class TranscriptExtractor:
                 'status': 'disabled',
                 'error': '자막이 비활성화되어 있습니다'
             }
+        except (TooManyRequests, YouTubeRequestFailed, requests.ConnectionError, requests.Timeout) as e:
+            # 재시도해도 풀리지 않은 요청 제한(429 포함)/일시적 오류는 자막이 있을 수 있으므로 별도 상태로 반환
+            if _is_retryable(e):
+                return {
+                    'video_id': video_id,
+                    'status': 'rate_limited',
+                    'error': f'YouTube 요청 제한 또는 일시적 오류로 자막을 가져오지 못했습니다: {e}'
+                }
+            return {
+                'video_id': video_id,
+                'status': 'error',
+                'error': str(e)
+            }
         except Exception as e:
             return {
                 'video_id': video_id,
@@ -124,6 +258,17 @@ class TranscriptExtractor:
                 'error': str(e)
             }
     
+    @staticmethod
+    def _with_retry(func, *args):
+        """요청 제한과 일시적인 네트워크 오류는 지수 백오프로 재시도하고 그 외 오류는 그대로 전달"""
+        for attempt in range(1, _TRANSCRIPT_MAX_ATTEMPTS + 1):
+            try:
+                return func(*args)
+            except (TooManyRequests, YouTubeRequestFailed, requests.ConnectionError, requests.Timeout) as e:
+                if attempt == _TRANSCRIPT_MAX_ATTEMPTS or not _is_retryable(e):
+                    raise
+                time.sleep(min(2 ** attempt, _TRANSCRIPT_RETRY_MAX_WAIT))
+    
     def _extract_with_whisper(self, video_id, url):
         """Whisper로 음성 인식"""
         try:
@@ -136,20 +281,13 @@ class TranscriptExtractor:
                     'error': '오디오 다운로드 실패'
                 }
             
-            # 2. 음성 인식
+            # 2. 음성 인식 + 3. 세그먼트 변환
             print(f"  🎤 Whisper 음성 인식 중... (시간 소요)")
-            result = self.whisper_model.transcribe(audio_path, verbose=False)
-            
-            # 3. 세그먼트 변환
-            segments = []
-            for segment in result['segments']:
-                segments.append({
-                    'text': segment['text'].strip(),
-                    'start': segment['start'],
-                    'duration': segment['end'] - segment['start']
-                })
+            with self._whisper_lock:
+                text, language, segments = self._transcribe(audio_path)
             
             # 4. 오디오 파일 삭제
+            self._audio_files.pop(video_id, None)
             try:
                 os.remove(audio_path)
             except:
@@ -157,15 +295,15 @@ class TranscriptExtractor:
             
             transcript = {
                 'video_id': video_id,
-                'language': result.get('language', 'unknown'),
+                'language': language or 'unknown',
                 'is_generated': True,
                 'method': 'whisper',
-                'text': result['text'].strip(),
+                'text': text,
                 'entries': segments,
                 'status': 'success'
             }
             
-            print(f"✅ Whisper 인식 완료: {video_id} (언어: {result.get('language')})")
+            print(f"✅ Whisper 인식 완료: {video_id} (언어: {language})")
             return transcript
             
         except Exception as e:
@@ -176,12 +314,41 @@ class TranscriptExtractor:
                 'error': str(e)
             }
     
-    def _download_audio(self, video_id, url):
-        """YouTube 오디오 다운로드"""
-        output_path = os.path.join(self.audio_dir, f"{video_id}.mp3")
+    def _transcribe(self, audio_path):
+        """
+        설치된 Whisper 백엔드로 음성 인식
         
-        if os.path.exists(output_path):
-            return output_path
+        Returns:
+            tuple: (전체 텍스트, 감지된 언어, 세그먼트 리스트)
+        """
+        model = _WhisperManager.get(self._whisper_size)
+        
+        if WHISPER_BACKEND == 'faster_whisper':
+            segments_iter, info = model.transcribe(audio_path)
+            raw_segments = [(seg.text, seg.start, seg.end) for seg in segments_iter]
+            language = info.language
+        else:
+            result = model.transcribe(audio_path, verbose=False, fp16=model.device.type == 'cuda')
+            raw_segments = [(seg['text'], seg['start'], seg['end']) for seg in result['segments']]
+            language = result.get('language')
+        
+        text = ''.join(seg_text for seg_text, _, _ in raw_segments).strip()
+        segments = [
+            {
+                'text': seg_text.strip(),
+                'start': start,
+                'duration': end - start
+            }
+            for seg_text, start, end in raw_segments
+        ]
+        
+        return text, language, segments
+    
+    def _download_audio(self, video_id, url):
+        """YouTube 오디오 다운로드 (원본 m4a/opus 그대로 저장)"""
+        existing = self._audio_files.get(video_id)
+        if existing:
+            return existing
 
         cookie_path = os.path.abspath('youtube.com_cookies.txt')
         print(f"  🔍 쿠키 파일 경로: {cookie_path}")
@@ -190,15 +357,13 @@ class TranscriptExtractor:
             print(f"  🔍 쿠키 파일 크기: {os.path.getsize(cookie_path)} bytes")
         
         ydl_opts = {
-            'format': 'bestaudio/best',
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
+            # Whisper가 ffmpeg로 직접 디코딩하므로 mp3 재인코딩 없이 원본 오디오 사용
+            'format': 'bestaudio[ext=m4a]/bestaudio/best',
             'outtmpl': os.path.join(self.audio_dir, f"{video_id}.%(ext)s"),
             'quiet': True,
             'no_warnings': True,
+            # DASH 오디오 조각을 여러 개 동시에 받아 영상 하나의 다운로드 시간 단축
+            'concurrent_fragment_downloads': 4,
             'cookiefile': os.path.abspath('youtube.com_cookies.txt'),
             'http_headers': {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -207,39 +372,63 @@ class TranscriptExtractor:
         
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
+                info = ydl.extract_info(url, download=True)
+                output_path = ydl.prepare_filename(info)
+            self._audio_files[video_id] = output_path
             return output_path
         except Exception as e:
             print(f"  ❌ 오디오 다운로드 실패: {str(e)}")
             return None
     
-    def extract_multiple(self, videos, use_whisper_fallback=None):
+    def _scan_audio_files(self):
+        """오디오 디렉토리를 한 번 훑어 video_id별 파일 경로 수집 (확장자는 원본 스트림에 따라 다름)"""
+        audio_files = {}
+        with os.scandir(self.audio_dir) as entries:
+            for entry in entries:
+                # 다운로드가 끝나지 않은 임시 파일 제외
+                if entry.name.endswith(('.part', '.ytdl')) or not entry.is_file():
+                    continue
+                video_id, _, _ = entry.name.rpartition('.')
+                if video_id:
+                    audio_files[video_id] = entry.path
+        return audio_files
+    
+    def extract_multiple(self, videos, use_whisper_fallback=None, max_workers=4, ignore_cache=False):
         """
         여러 영상의 자막 일괄 추출
         
         Args:
             videos: 영상 정보 리스트
             use_whisper_fallback: Whisper 사용 여부 (None이면 초기화 설정 따름)
+            max_workers: 동시에 추출할 영상 수 (네트워크 대기가 대부분이므로 스레드 사용)
+            ignore_cache: True면 저장된 자막을 무시하고 다시 추출
         """
         if use_whisper_fallback is not None:
             original_setting = self.use_whisper
             self.use_whisper = use_whisper_fallback and WHISPER_AVAILABLE
         
-        results = []
-        
-        for i, video in enumerate(videos, 1):
+        def extract_one(video):
             video_id = video['video_id']
             url = video.get('url', f"https://www.youtube.com/watch?v={video_id}")
             
-            print(f"[{i}/{len(videos)}] 자막 추출 중: {video['title'][:50]}...")
-            
-            transcript = self.extract_transcript(video_id, url)
+            transcript = self.extract_transcript(video_id, url, ignore_cache=ignore_cache)
             
             transcript['video_title'] = video['title']
             transcript['video_url'] = url
             transcript['channel'] = video['channel']
-            
-            results.append(transcript)
+            return transcript
+        
+        # 완료 순서와 관계없이 입력 순서대로 결과 저장
+        results = [None] * len(videos)
+        
+        if videos:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(videos))) as executor:
+                futures = {executor.submit(extract_one, video): i for i, video in enumerate(videos)}
+                
+                for done, future in enumerate(as_completed(futures), 1):
+                    i = futures[future]
+                    results[i] = future.result()
+                    print(f"[{done}/{len(videos)}] 자막 추출 완료: {videos[i]['title'][:50]}...")
         
         if use_whisper_fallback is not None:
             self.use_whisper = original_setting
@@ -259,26 +448,46 @@ class TranscriptExtractor:
                     f"{video_id}_{method}.json"
                 )
                 
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(transcript, f, ensure_ascii=False, indent=2)
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(transcript, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+                
+                # YouTube API 자막이 이미 있으면 그쪽을 계속 우선
+                if method in _TRANSCRIPT_SUFFIXES and (
+                        method == 'youtube_api' or video_id not in self._transcript_files):
+                    self._transcript_files[video_id] = filepath
         
         print(f"✅ 자막 파일 저장 완료: {self.transcript_dir}")
     
+    def _scan_transcript_files(self):
+        """자막 디렉토리를 한 번 훑어 video_id별 파일 경로 수집 (YouTube API 자막 우선)"""
+        transcript_files = {}
+        with os.scandir(self.transcript_dir) as entries:
+            for entry in entries:
+                for method, suffix in _TRANSCRIPT_SUFFIXES.items():
+                    if entry.name.endswith(suffix) and entry.is_file():
+                        video_id = entry.name[:-len(suffix)]
+                        if method == 'youtube_api' or video_id not in transcript_files:
+                            transcript_files[video_id] = entry.path
+                        break
+        return transcript_files
+    
+    def list_cached_ids(self):
+        """저장된 자막이 있는 video_id 집합"""
+        return set(self._transcript_files)
+    
     def load_transcript(self, video_id):
-        """저장된 자막 로드"""
-        # YouTube API 자막 우선
-        filepath = os.path.join(self.transcript_dir, f"{video_id}_youtube_api.json")
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        
-        # Whisper 자막
-        filepath = os.path.join(self.transcript_dir, f"{video_id}_whisper.json")
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        """저장된 자막 로드 (YouTube API 자막 우선, 없으면 Whisper 자막)"""
+        filepath = self._transcript_files.get(video_id)
+        if filepath is None:
+            return None
         
-        return None
+        try:
+            with open(filepath, 'rb') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            # 실행 중 외부에서 삭제된 경우
+            self._transcript_files.pop(video_id, None)
+            return None
     
     def is_english_content(self, transcript):
         """영어 학습 콘텐츠인지 판단"""
@@ -288,7 +497,5 @@ class TranscriptExtractor:
         if transcript.get('language') in ['en', 'en-US', 'en-GB']:
             return True
         
-        title = transcript.get('video_title', '').lower()
-        english_keywords = ['english', '영어', 'toeic', 'speaking', 'grammar', 'vocabulary']
-        
-        return any(keyword in title for keyword in english_keywords)
+        # 제목 전체를 정규식 한 번으로 검사 (대소문자 무시)
+        return _ENGLISH_KEYWORD_RE.search(transcript.get('video_title', '')) is not None
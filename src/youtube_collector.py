@@ -1,14 +1,19 @@
 """
 YouTube 좋아요 영상 목록 수집 모듈
 """
-import json
 import os
+import mmap
+import orjson
 from datetime import datetime
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-import pickle
+
+# videos.list 요청 한 번에 보낼 수 있는 최대 ID 수
+_MAX_IDS_PER_REQUEST = 50
+_VIDEO_PARTS = 'snippet,contentDetails,statistics'
+
 
 class YouTubeCollector:
     def __init__(self, config):
@@ -20,11 +25,18 @@ class YouTubeCollector:
         """OAuth 2.0 인증"""
         SCOPES = ['https://www.googleapis.com/auth/youtube.readonly']
         creds = None
+        save_token = False
         
-        # token.pickle 파일이 있으면 로드
-        if os.path.exists('token.pickle'):
+        # token.json 파일이 있으면 로드 (pickle과 달리 로드 시 코드 실행 위험 없음)
+        if os.path.exists('token.json'):
+            with open('token.json', 'rb') as token:
+                creds = Credentials.from_authorized_user_info(orjson.loads(token.read()), SCOPES)
+        elif os.path.exists('token.pickle'):
+            # 이전 버전의 token.pickle은 한 번 읽어 token.json으로 옮김
+            import pickle
             with open('token.pickle', 'rb') as token:
                 creds = pickle.load(token)
+            save_token = True
         
         # 유효한 credentials가 없으면 로그인
         if not creds or not creds.valid:
@@ -34,10 +46,12 @@ class YouTubeCollector:
                 flow = InstalledAppFlow.from_client_secrets_file(
                     'client_secret.json', SCOPES)
                 creds = flow.run_local_server(port=0)
-            
-            # 다음 실행을 위해 저장
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(creds, token)
+            save_token = True
+        
+        # 다음 실행을 위해 저장
+        if save_token:
+            with open('token.json', 'wb') as token:
+                token.write(creds.to_json().encode('utf-8'))
         
         self.credentials = creds
         self.youtube = build('youtube', 'v3', credentials=creds)
@@ -49,51 +63,104 @@ class YouTubeCollector:
             self.authenticate()
         
         liked_videos = []
+        # myRating 조회는 한 번에 상세 정보까지 최대 50개씩 반환 (API 상한)
         request = self.youtube.videos().list(
-            part='snippet,contentDetails,statistics',
+            part=_VIDEO_PARTS,
             myRating='like',
-            maxResults=max_results
+            maxResults=min(max_results, _MAX_IDS_PER_REQUEST)
         )
         
         while request and len(liked_videos) < max_results:
             response = request.execute()
             
-            for item in response.get('items', []):
-                video_data = {
-                    'video_id': item['id'],
-                    'title': item['snippet']['title'],
-                    'description': item['snippet']['description'],
-                    'channel': item['snippet']['channelTitle'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'duration': item['contentDetails']['duration'],
-                    'view_count': item['statistics'].get('viewCount', 0),
-                    'like_count': item['statistics'].get('likeCount', 0),
-                    'url': f"https://www.youtube.com/watch?v={item['id']}",
-                    'collected_at': datetime.now().isoformat()
-                }
-                liked_videos.append(video_data)
+            # 마지막 페이지는 max_results를 넘는 만큼 잘라냄
+            for item in response.get('items', [])[:max_results - len(liked_videos)]:
+                liked_videos.append(self._to_video_data(item))
             
             request = self.youtube.videos().list_next(request, response)
         
         print(f"✅ 총 {len(liked_videos)}개의 좋아요 영상 수집 완료")
         return liked_videos
     
+    def _fetch_video_details(self, video_ids):
+        """
+        video_id 목록의 상세 정보 조회
+        
+        요청 하나에 ID를 50개씩 묶어 보내므로 N개 영상에 ceil(N/50)번만 호출합니다.
+        
+        Args:
+            video_ids: YouTube 영상 ID 리스트
+        
+        Returns:
+            list: 영상 메타데이터 리스트 (삭제/비공개 영상은 제외)
+        """
+        if not self.youtube:
+            self.authenticate()
+        
+        videos = []
+        for start in range(0, len(video_ids), _MAX_IDS_PER_REQUEST):
+            chunk = video_ids[start:start + _MAX_IDS_PER_REQUEST]
+            response = self.youtube.videos().list(
+                part=_VIDEO_PARTS,
+                id=','.join(chunk)
+            ).execute()
+            
+            for item in response.get('items', []):
+                videos.append(self._to_video_data(item))
+        
+        return videos
+    
+    def refresh_video_details(self, videos):
+        """
+        저장된 영상 목록의 메타데이터(제목, 조회수 등)를 최신 정보로 갱신
+        
+        Args:
+            videos: 영상 메타데이터 리스트 (load_from_json 결과 등)
+        
+        Returns:
+            list: 같은 순서의 영상 리스트 (조회되지 않은 삭제/비공개 영상은 기존 데이터 유지)
+        """
+        video_ids = list(dict.fromkeys(v['video_id'] for v in videos))
+        latest = {v['video_id']: v for v in self._fetch_video_details(video_ids)}
+        
+        print(f"✅ 영상 정보 갱신 완료: {len(latest)}/{len(video_ids)}개")
+        return [latest.get(v['video_id'], v) for v in videos]
+    
+    @staticmethod
+    def _to_video_data(item):
+        """videos.list 응답 항목을 영상 메타데이터 dict로 변환"""
+        snippet = item['snippet']
+        return {
+            'video_id': item['id'],
+            'title': snippet['title'],
+            'description': snippet['description'],
+            'channel': snippet['channelTitle'],
+            'published_at': snippet['publishedAt'],
+            'duration': item['contentDetails']['duration'],
+            'view_count': item['statistics'].get('viewCount', 0),
+            'like_count': item['statistics'].get('likeCount', 0),
+            'url': f"https://www.youtube.com/watch?v={item['id']}",
+            'collected_at': datetime.now().isoformat()
+        }
+    
     def save_to_json(self, videos, filepath='data/likes_raw.json'):
         """수집한 데이터를 JSON으로 저장"""
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(videos, f, ensure_ascii=False, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(videos, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         print(f"✅ 데이터 저장 완료: {filepath}")
         
     def load_from_json(self, filepath='data/likes_raw.json'):
         """저장된 JSON 데이터 로드"""
-        if not os.path.exists(filepath):
+        if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
             return []
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # 파일을 메모리 매핑해 별도 읽기 버퍼 없이 바로 파싱
+        with open(filepath, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return orjson.loads(memoryview(data))
         
     def filter_new_videos(self, current_videos, previous_videos):
         """새로운 영상만 필터링"""
@@ -105,11 +172,10 @@ class YouTubeCollector:
 
 
 if __name__ == "__main__":
-    import yaml
+    from config_loader import load_config
     
     # 설정 로드
-    with open('config/config.yaml', 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config = load_config('config/config.yaml')
     
     # 수집 실행
     collector = YouTubeCollector(config)
@@ -0,0 +1,73 @@
+"""
+리포트 생성 모듈 테스트
+"""
+import os
+import re
+import tempfile
+import unittest
+import zipfile
+
+from src.reporter import ReportGenerator, _unique_sheet_names
+
+
+class ReportGeneratorTest(unittest.TestCase):
+    def setUp(self):
+        # 작업 디렉토리 아래 outputs 폴더가 생기므로 임시 디렉토리에서 실행
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.addCleanup(self._restore_cwd)
+        self.reporter = ReportGenerator()
+    
+    def _restore_cwd(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+    
+    def test_partition_does_not_modify_summaries(self):
+        summaries = [
+            {'video_id': 'a', 'status': 'success'},
+            {'video_id': 'b', 'status': 'success', 'type': 'english_learning', 'method': 'whisper'},
+            {'video_id': 'c'}
+        ]
+        before = [dict(s) for s in summaries]
+        
+        partition = self.reporter._partition(summaries)
+        
+        self.assertEqual(summaries, before)
+        self.assertEqual([s['video_id'] for s in partition.success], ['a', 'b'])
+        self.assertEqual([s['video_id'] for s in partition.english], ['b'])
+        self.assertEqual([s['video_id'] for s in partition.whisper], ['b'])
+
+    
+    def test_excel_report_with_colliding_sheet_names(self):
+        long_a = '가' * 31 + 'A'
+        long_b = '가' * 31 + 'B'
+        categories = [long_a, long_b, '전체', '영어학습_복습용', 'Q&A: 질문?']
+        
+        summaries, categorized = [], {}
+        for i, category in enumerate(categories):
+            video_id = f'v{i}'
+            summaries.append({
+                'video_id': video_id, 'video_title': 't', 'channel': 'c', 'video_url': 'u',
+                'summary': 's', 'status': 'success', 'type': 'english_learning'
+            })
+            categorized[category] = [{'video_id': video_id}]
+        
+        filepath = self.reporter.generate_excel_report(summaries, categorized, filename='report.xlsx')
+        
+        with zipfile.ZipFile(filepath) as xlsx:
+            workbook = xlsx.read('xl/workbook.xml').decode('utf-8')
+        sheet_names = re.findall(r'<sheet name="([^"]*)"', workbook)
+        
+        self.assertEqual(len(sheet_names), len(categories) + 2)
+        self.assertEqual(len({name.lower() for name in sheet_names}), len(sheet_names))
+        self.assertEqual(sheet_names[0], '전체')
+        self.assertEqual(sheet_names[-1], '영어학습_복습용')
+    
+    def test_unique_sheet_names(self):
+        names = _unique_sheet_names(['a' * 40, 'a' * 35, 'Sheet', 'sheet', '전체', 'x/y'], reserved=['전체'])
+        
+        self.assertEqual(names, ['a' * 31, 'a' * 29 + '_2', 'Sheet', 'sheet_2', '전체_2', 'x_y'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+요약 모듈 테스트 (API 호출 없이 저장된 요약/인덱스만 검사)
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import orjson
+
+from src.summarizer import VideoSummarizer
+
+
+CONFIG = {'anthropic': {'api_key': 'test-key', 'model': 'test-model'}}
+
+
+class SummaryIndexTest(unittest.TestCase):
+    def setUp(self):
+        # 작업 디렉토리 아래 data/summaries 폴더가 생기므로 임시 디렉토리에서 실행
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.addCleanup(self._restore_cwd)
+    
+    def _restore_cwd(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+    
+    def _summary(self, text):
+        return {
+            'video_id': 'video',
+            'type': 'general',
+            'summary': text,
+            'status': 'success',
+            'cache_key': 'key'
+        }
+    
+    def test_edited_summary_file_is_reloaded(self):
+        VideoSummarizer(CONFIG).save_summaries([self._summary('old')])
+        
+        path = os.path.join('data', 'summaries', 'video_summary.json')
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(self._summary('edited by hand')))
+        
+        self.assertEqual(VideoSummarizer(CONFIG).load_summary('video')['summary'], 'edited by hand')
+    
+    def test_index_stores_metadata_only(self):
+        VideoSummarizer(CONFIG).save_summaries([self._summary('body')])
+        
+        with open(os.path.join('data', 'summaries', '_index.json'), 'rb') as f:
+            index = orjson.loads(f.read())
+        self.assertEqual(set(index['video']), {'cache_key', 'mtime_ns', 'size'})
+    
+    def test_constructor_does_not_rewrite_unchanged_index(self):
+        VideoSummarizer(CONFIG).save_summaries([self._summary('body')])
+        
+        index_path = os.path.join('data', 'summaries', '_index.json')
+        before = os.stat(index_path).st_mtime_ns
+        os.utime(index_path, ns=(before - 10**9, before - 10**9))
+        
+        VideoSummarizer(CONFIG)
+        self.assertEqual(os.stat(index_path).st_mtime_ns, before - 10**9)
+
+    
+    def test_cached_summary_requires_matching_key(self):
+        transcript = {'video_id': 'video', 'status': 'success', 'text': 'transcript text'}
+        summarizer = VideoSummarizer(CONFIG)
+        summary = self._summary('body')
+        summary['cache_key'] = summarizer._cache_key(transcript, 'general')
+        summarizer.save_summaries([summary])
+        
+        reloaded = VideoSummarizer(CONFIG)
+        self.assertEqual(reloaded.get_cached_summary(transcript, 'general')['summary'], 'body')
+        self.assertIsNone(reloaded.get_cached_summary(transcript, 'english_learning'))
+        self.assertIsNone(reloaded.get_cached_summary(dict(transcript, text='re-fetched'), 'general'))
+        
+        other_model = {'anthropic': {'api_key': 'test-key', 'model': 'other-model'}}
+        self.assertIsNone(VideoSummarizer(other_model).get_cached_summary(transcript, 'general'))
+    
+    def _write_legacy(self, **fields):
+        """cache_key 필드가 없는 이전 버전 요약 파일 기록"""
+        os.makedirs(os.path.join('data', 'summaries'), exist_ok=True)
+        legacy = self._summary('legacy')
+        del legacy['cache_key']
+        legacy.update(fields, video_title='title', video_url='url', channel='channel')
+        with open(os.path.join('data', 'summaries', 'video_summary.json'), 'wb') as f:
+            f.write(orjson.dumps(legacy))
+    
+    def test_legacy_summary_without_cache_key_is_reused_without_api_call(self):
+        self._write_legacy()
+        transcript = {
+            'video_id': 'video', 'status': 'success', 'text': 'transcript text',
+            'video_title': 'title', 'video_url': 'url', 'channel': 'channel'
+        }
+        
+        summarizer = VideoSummarizer(CONFIG)
+        summarizer.client = mock.Mock()
+        result = summarizer.summarize_general(transcript)
+        
+        summarizer.client.messages.create.assert_not_called()
+        self.assertEqual(result['summary'], 'legacy')
+        self.assertEqual(result['cache_key'], summarizer._cache_key(transcript, 'general'))
+        
+        # 기록한 키는 저장 후 다음 실행에서 그대로 일치
+        summarizer.save_summaries([result])
+        self.assertEqual(VideoSummarizer(CONFIG).get_cached_summary(transcript, 'general')['summary'], 'legacy')
+    
+    def test_legacy_summary_of_other_type_or_model_is_not_reused(self):
+        transcript = {'video_id': 'video', 'status': 'success', 'text': 'transcript text'}
+        
+        self._write_legacy()
+        self.assertIsNone(VideoSummarizer(CONFIG).get_cached_summary(transcript, 'english_learning'))
+        
+        self._write_legacy(model='other-model')
+        self.assertIsNone(VideoSummarizer(CONFIG).get_cached_summary(transcript, 'general'))
+
+if __name__ == '__main__':
+    unittest.main()
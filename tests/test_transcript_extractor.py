@@ -0,0 +1,77 @@
+"""
+자막 추출 모듈 테스트 (네트워크 없이 YouTube 응답을 흉내냄)
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+from youtube_transcript_api._errors import YouTubeRequestFailed
+
+from src import transcript_extractor
+from src.transcript_extractor import TranscriptExtractor
+
+
+class _FailingFetcher:
+    """매번 같은 HTTP 상태 코드로 실패하는 TranscriptListFetcher 대체"""
+    status_code = None
+    calls = 0
+    
+    def __init__(self, http_client):
+        pass
+    
+    def fetch(self, video_id):
+        type(self).calls += 1
+        response = requests.Response()
+        response.status_code = self.status_code
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as error:
+            # 라이브러리와 같이 HTTPError를 감싸서 전달
+            raise YouTubeRequestFailed(error, video_id)
+
+
+class RateLimitTest(unittest.TestCase):
+    def setUp(self):
+        # 작업 디렉토리 아래 data/ 폴더가 생기므로 임시 디렉토리에서 실행
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.addCleanup(self._restore_cwd)
+        
+        sleep = mock.patch.object(transcript_extractor.time, 'sleep')
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+        
+        self.extractor = TranscriptExtractor()
+        self.extractor.use_whisper = True
+        self.extractor._extract_with_whisper = mock.Mock()
+    
+    def _restore_cwd(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+    
+    def _extract_with_status(self, status_code):
+        fetcher = type('Fetcher', (_FailingFetcher,), {'status_code': status_code, 'calls': 0})
+        with mock.patch.object(transcript_extractor, 'TranscriptListFetcher', fetcher):
+            result = self.extractor.extract_transcript('video', url='https://youtu.be/video', ignore_cache=True)
+        return result, fetcher.calls
+    
+    def test_http_429_on_every_attempt_skips_whisper(self):
+        result, calls = self._extract_with_status(429)
+        
+        self.assertEqual(result['status'], 'rate_limited')
+        self.assertEqual(calls, transcript_extractor._TRANSCRIPT_MAX_ATTEMPTS)
+        self.extractor._extract_with_whisper.assert_not_called()
+    
+    def test_http_404_is_not_retried_and_falls_back_to_whisper(self):
+        result, calls = self._extract_with_status(404)
+        
+        self.assertEqual(calls, 1)
+        self.sleep.assert_not_called()
+        self.extractor._extract_with_whisper.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+YouTube 수집 모듈 테스트 (API 클라이언트를 흉내냄)
+"""
+import unittest
+from unittest import mock
+
+try:
+    from src.youtube_collector import YouTubeCollector
+    GOOGLE_API_AVAILABLE = True
+except ImportError:
+    GOOGLE_API_AVAILABLE = False
+
+
+def _item(video_id):
+    """videos.list 응답 항목"""
+    return {
+        'id': video_id,
+        'snippet': {
+            'title': f'title {video_id}',
+            'description': '',
+            'channelTitle': 'channel',
+            'publishedAt': '2024-01-01T00:00:00Z'
+        },
+        'contentDetails': {'duration': 'PT1M'},
+        'statistics': {'viewCount': '1'}
+    }
+
+
+@unittest.skipUnless(GOOGLE_API_AVAILABLE, 'google-api-python-client가 설치되지 않았습니다')
+class FetchVideoDetailsTest(unittest.TestCase):
+    def setUp(self):
+        self.collector = YouTubeCollector({})
+        self.collector.youtube = mock.Mock()
+        
+        def videos_list(part, id):
+            request = mock.Mock()
+            request.execute.return_value = {'items': [_item(i) for i in id.split(',')]}
+            return request
+        
+        self.videos_list = self.collector.youtube.videos.return_value.list
+        self.videos_list.side_effect = videos_list
+    
+    def test_120_ids_use_3_requests(self):
+        ids = [f'v{i}' for i in range(120)]
+        videos = self.collector._fetch_video_details(ids)
+        
+        self.assertEqual(self.videos_list.call_count, 3)
+        chunk_sizes = [len(call.kwargs['id'].split(',')) for call in self.videos_list.call_args_list]
+        self.assertEqual(chunk_sizes, [50, 50, 20])
+        self.assertEqual([v['video_id'] for v in videos], ids)
+    
+    def test_refresh_keeps_order_and_unavailable_videos(self):
+        self.videos_list.side_effect = None
+        self.videos_list.return_value.execute.return_value = {'items': [_item('b')]}
+        stored = [{'video_id': 'a', 'title': 'deleted'}, {'video_id': 'b', 'title': 'old'}]
+        
+        refreshed = self.collector.refresh_video_details(stored)
+        
+        self.assertEqual([v['title'] for v in refreshed], ['deleted', 'title b'])
+
+    
+    def test_liked_videos_stop_at_max_results(self):
+        # 페이지마다 50개씩, 3페이지까지 있는 좋아요 목록
+        pages = iter([[_item(f'p{page}_{i}') for i in range(50)] for page in range(3)])
+        videos = self.collector.youtube.videos.return_value
+        videos.list.side_effect = None
+        videos.list.return_value.execute.side_effect = lambda: {'items': next(pages)}
+        videos.list_next.return_value = videos.list.return_value
+        
+        liked = self.collector.get_liked_videos(max_results=60)
+        
+        self.assertEqual(len(liked), 60)
+        self.assertEqual(videos.list.call_args.kwargs['maxResults'], 50)
+        self.assertEqual(videos.list.return_value.execute.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()